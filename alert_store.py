@@ -0,0 +1,233 @@
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+ALERTS_DB = "alerts.db"
+FLUSH_INTERVAL = 1.0
+MAX_BATCH_SIZE = 200
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        username TEXT,
+        timestamp REAL NOT NULL,
+        label TEXT NOT NULL,
+        confidence REAL,
+        bbox TEXT,
+        evidence_path TEXT,
+        message TEXT,
+        end_timestamp REAL,
+        frame_count INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts (timestamp);
+    CREATE INDEX IF NOT EXISTS idx_alerts_session ON alerts (session_id, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_alerts_user ON alerts (username, timestamp);
+"""
+
+COLUMNS = ("id", "session_id", "username", "timestamp", "label", "confidence", "bbox", "evidence_path", "message",
+           "end_timestamp", "frame_count")
+# Columns added after the first release of the table, with their SQL types.
+MIGRATED_COLUMNS = {"end_timestamp": "REAL", "frame_count": "INTEGER"}
+LEGACY_ALERT_PATTERN = re.compile(r"detected at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+
+def connect_db(db_path):
+    """Open a SQLite database in WAL mode for the app's stores (alerts, recordings catalog, thumbnails)."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def format_alert(alert):
+    """Render an alert row as the one-line text shown on the alerts page."""
+    when = datetime.fromtimestamp(alert["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+    line = alert["message"] or f"Alert: {alert['label']} detected at {when}"
+    details = [f"user: {alert['username']}", f"session: {alert['session_id']}"]
+    if alert["end_timestamp"] is not None:
+        details.append(f"duration: {alert['end_timestamp'] - alert['timestamp']:.1f}s")
+    if alert["frame_count"] is not None:
+        details.append(f"frames: {alert['frame_count']}")
+    if alert["confidence"] is not None:
+        details.append(f"confidence: {alert['confidence']:.1f}%")
+    if alert["evidence_path"]:
+        details.append(f"evidence: {alert['evidence_path']}")
+    return f"{line} ({', '.join(details)})"
+
+
+class AlertStore:
+    """Append-only SQLite (WAL) store for proctoring alerts.
+
+    `add_alert` only enqueues; a background thread commits queued alerts in
+    batches every `flush_interval` seconds or `max_batch_size` rows.
+    Reads go through indexed queries on timestamp, session and user.
+    """
+
+    def __init__(self, db_path=ALERTS_DB, flush_interval=FLUSH_INTERVAL, max_batch_size=MAX_BATCH_SIZE):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+
+        self._read_lock = threading.Lock()
+        self._conn = connect_db(db_path)
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="alert-store", daemon=True)
+        self._writer.start()
+
+    def _migrate(self):
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(alerts)")}
+        for column, column_type in MIGRATED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE alerts ADD COLUMN {column} {column_type}")
+
+    def add_alert(self, session_id, username, timestamp, label, confidence=None, bbox=None,
+                  evidence_path=None, message=None, end_timestamp=None, frame_count=None):
+        """Queue one alert for the next batched commit."""
+        bbox_text = ",".join(str(int(v)) for v in bbox) if bbox is not None else None
+        self._queue.put((session_id, username, timestamp, label, confidence, bbox_text, evidence_path, message,
+                         end_timestamp, frame_count))
+
+    def add_incident(self, session_id, username, incident, message=None, scored=True):
+        """Queue one record summarising a closed Incident from incidents.IncidentEngine.
+
+        Pass `scored=False` for engines fed a 0/1 signal rather than a confidence
+        percentage; their peak score is stored as no confidence instead of "1.0%".
+        """
+        self.add_alert(
+            session_id, username, incident.start, incident.kind,
+            confidence=incident.peak_score if scored else None, bbox=incident.peak_bbox, evidence_path=incident.evidence_path,
+            message=message, end_timestamp=incident.end, frame_count=incident.frame_count,
+        )
+
+    def flush(self):
+        """Commit queued alerts now and block until they are written."""
+        self._queue.put(None)
+        self._queue.join()
+
+    def _write_loop(self):
+        conn = connect_db(self.db_path)
+        while True:
+            # None is a flush marker: commit what has been gathered without waiting out the interval.
+            batch = [self._queue.get()]
+            deadline = time.time() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.max_batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO alerts (session_id, username, timestamp, label, confidence, bbox, "
+                            "evidence_path, message, end_timestamp, frame_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows,
+                        )
+            except sqlite3.Error as error:
+                print(f"Failed to write {len(rows)} alerts: {error}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _where(self, username=None, session_id=None, since=None, until=None, search=None):
+        clauses, params = [], []
+        if username is not None:
+            clauses.append("username = ?")
+            params.append(username)
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if search:
+            clauses.append("(message LIKE ? OR label LIKE ? OR username LIKE ? OR session_id LIKE ?)")
+            params += [f"%{search}%"] * 4
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, username=None, session_id=None, since=None, until=None, limit=None, offset=0, newest_first=True,
+              search=None):
+        """Return alerts as dicts, filtered by user/session/time range and a substring `search`."""
+        where, params = self._where(username, session_id, since, until, search)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM alerts{where} ORDER BY timestamp {'DESC' if newest_first else 'ASC'}, id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._read_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, username=None, session_id=None, since=None, until=None, search=None):
+        where, params = self._where(username, session_id, since, until, search)
+        with self._read_lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM alerts{where}", params).fetchone()[0]
+
+    def delete_all(self):
+        """Remove every alert and return the evidence paths they referenced."""
+        self.flush()
+        with self._read_lock:
+            paths = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT evidence_path FROM alerts WHERE evidence_path IS NOT NULL")]
+            with self._conn:
+                self._conn.execute("DELETE FROM alerts")
+        return paths
+
+    def import_text_alerts(self, alerts_dir):
+        """Move legacy one-file-per-alert .txt files into the store and delete them.
+
+        The rows are committed directly rather than through the batching
+        writer, so a file is only removed once its alert is known to be stored;
+        if the insert fails the sqlite3.Error propagates and nothing is deleted.
+        """
+        if not os.path.isdir(alerts_dir):
+            return 0
+        imported, rows = [], []
+        for alert_filename in os.listdir(alerts_dir):
+            alert_path = os.path.join(alerts_dir, alert_filename)
+            if not (alert_filename.endswith(".txt") and os.path.isfile(alert_path)):
+                continue
+            with open(alert_path, "r") as alert_file:
+                message = alert_file.readline().strip()
+            match = LEGACY_ALERT_PATTERN.search(message)
+            timestamp = (datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+                         if match else os.path.getmtime(alert_path))
+            rows.append(("legacy", None, timestamp, "Not Allowed", message))
+            imported.append(alert_path)
+        if not rows:
+            return 0
+        with self._read_lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO alerts (session_id, username, timestamp, label, message) VALUES (?, ?, ?, ?, ?)", rows)
+        for alert_path in imported:
+            os.remove(alert_path)
+        return len(imported)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_alert_store():
+    """Return the process-wide AlertStore, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AlertStore()
+        return _store
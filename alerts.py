@@ -1,6 +1,8 @@
-import tkinter as tk
-from tkinter import Label, Text, Button
+from tkinter import Label, Button
 import os
+import sqlite3
+from alert_store import get_alert_store, format_alert
+from virtual_list import VirtualList
 
 ALERTS_DIR = "alerts"
 
@@ -8,15 +10,27 @@ ALERTS_DIR = "alerts"
 if not os.path.exists(ALERTS_DIR):
     os.makedirs(ALERTS_DIR)
 
+_legacy_alerts_imported = False
+
+
+def _prepare_alert_store():
+    """Return the alert store with legacy .txt alerts imported (once per process) and queued alerts committed."""
+    global _legacy_alerts_imported
+    store = get_alert_store()
+    if not _legacy_alerts_imported:
+        try:
+            store.import_text_alerts(ALERTS_DIR)
+            _legacy_alerts_imported = True
+        except sqlite3.Error as error:
+            # The .txt files are kept, so the import is retried the next time the page opens.
+            print(f"Failed to import legacy alerts: {error}")
+    store.flush()
+    return store
+
+
 def get_all_alerts():
-    """Retrieve all alert messages from the alerts directory."""
-    alerts = []
-    for alert_filename in os.listdir(ALERTS_DIR):
-        alert_path = os.path.join(ALERTS_DIR, alert_filename)
-        if os.path.isfile(alert_path):
-            with open(alert_path, 'r') as alert_file:
-                alerts.append(alert_file.read())
-    return alerts
+    """Retrieve all alert messages from the alert store, newest first."""
+    return [format_alert(alert) for alert in _prepare_alert_store().query()]
 
 
 class AlertsPage:
@@ -47,10 +61,17 @@ class AlertsPage:
         title_label.grid(row=0, column=0, columnspan=2, pady=10)
 
        
-        self.alert_log_area = Text(
-            self.root, height=20, width=80, bg="#FFFFFF", fg="#000000"
+        self.store = _prepare_alert_store()
+        self.alerts_list = VirtualList(
+            self.root,
+            count=lambda search: self.store.count(search=search),
+            fetch=lambda offset, limit, search: self.store.query(limit=limit, offset=offset, search=search),
+            format_row=format_alert,
+            empty_text="No alerts found.",
+            bg=self.bg_color,
+            height=20, width=80, background="#FFFFFF", foreground="#000000",
         )
-        self.alert_log_area.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.alerts_list.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
 
     
         return_button = Button(
@@ -82,21 +103,17 @@ class AlertsPage:
         self.load_alerts()
 
     def load_alerts(self):
-        alerts = get_all_alerts() 
-        if not alerts:
-            self.alert_log_area.insert(tk.END, "No alerts found.\n")
-        else:
-            for alert in alerts:
-                self.alert_log_area.insert(tk.END, f"{alert}\n")
+        """Show the visible window of alerts; older ones are fetched as the list scrolls."""
+        self.alerts_list.refresh()
 
     def delete_alerts(self):
-        """Clear all the alerts from the text area and delete from the file system."""
-        self.alert_log_area.delete(1.0, tk.END)
-        
+        """Clear all the alerts from the list, the alert store and the evidence clips on disk."""
+        get_alert_store().delete_all()
         for alert_filename in os.listdir(ALERTS_DIR):
             alert_path = os.path.join(ALERTS_DIR, alert_filename)
             if os.path.isfile(alert_path):
                 os.remove(alert_path)
+        self.alerts_list.refresh(keep_position=False)
 
     def return_to_menu(self):
         from menu import MenuPage
@@ -105,7 +122,7 @@ class AlertsPage:
 
     def refresh_alerts(self):
         """Refresh the displayed alerts."""
-        self.alert_log_area.delete(1.0, tk.END)
+        _prepare_alert_store()
         self.load_alerts()
 
     def clear_frame(self):
@@ -0,0 +1,195 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from inference_engine import INPUT_SIZE, MAX_BATCH_SIZE, compile_keras_model
+
+
+# Default model files per runtime; the .tflite and .onnx files are produced by export_tflite.py.
+# Other models trained in Models/*.ipynb ship no weights: export one yourself and point "model_path" at it.
+MODEL_PATHS = {
+    "cnn": {"keras": "CNN_Model2.keras", "tflite": "CNN_Model2.tflite", "onnx": "CNN_Model2.onnx"},
+}
+
+# Every batch size the InferenceEngine's micro-batcher can produce.
+WARMUP_BATCH_SIZES = tuple(range(1, MAX_BATCH_SIZE + 1))
+WARMUP_RUNS = 3
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """Class decorator that makes a backend selectable by name in the config."""
+    def decorator(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def resolve_model_path(model_name, backend_name, model_path=None):
+    if model_path:
+        return model_path
+    try:
+        return MODEL_PATHS[model_name][backend_name]
+    except KeyError:
+        raise ValueError(f"No default {backend_name} file for model '{model_name}'; set model_path in the config")
+
+
+class InferenceBackend(ABC):
+    """Common interface: `predict_batch(uint8 crops (N, 128, 128, 3)) -> float probabilities (N, classes)`.
+
+    Subclasses implement `_load` and `_predict`; this base class adds
+    warm-up and per-backend throughput counters.
+    """
+
+    name = None
+
+    def __init__(self, model_path, num_threads=None, use_mmap=True):
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.use_mmap = use_mmap
+        self.load_ms = None
+        self.warmup_ms = None
+        self.warmup_report = {}
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._images = 0
+        self._busy_seconds = 0.0
+
+    def load(self):
+        started = time.perf_counter()
+        self._load()
+        self.load_ms = (time.perf_counter() - started) * 1000
+        print(f"{self.name} backend loaded {self.model_path} in {self.load_ms:.0f} ms")
+        return self
+
+    def warm_up(self, batch_sizes=WARMUP_BATCH_SIZES, runs=WARMUP_RUNS):
+        """Run dummy batches at every batch size so tracing and allocation happen before the first real frame.
+
+        Records cold (first call) and warm (median of `runs` further calls)
+        latency per batch size in `warmup_report`.
+        """
+        height, width = INPUT_SIZE
+        started = time.perf_counter()
+        self._prepare(batch_sizes)
+        report = {}
+        for batch_size in batch_sizes:
+            dummy = np.zeros((batch_size, height, width, 3), dtype=np.uint8)
+            call_started = time.perf_counter()
+            self._predict(dummy)
+            cold_ms = (time.perf_counter() - call_started) * 1000
+            warm_ms = []
+            for _ in range(runs):
+                call_started = time.perf_counter()
+                self._predict(dummy)
+                warm_ms.append((time.perf_counter() - call_started) * 1000)
+            report[batch_size] = {"cold_ms": cold_ms, "warm_ms": float(np.median(warm_ms)) if warm_ms else cold_ms}
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        self.warmup_report = report
+        print(f"{self.name} backend warmed up in {self.warmup_ms:.0f} ms")
+        for batch_size, timing in report.items():
+            print(f"  batch {batch_size}: cold {timing['cold_ms']:.1f} ms, warm {timing['warm_ms']:.1f} ms")
+        return self
+
+    def predict_batch(self, crops):
+        started = time.perf_counter()
+        probabilities = self._predict(np.asarray(crops, dtype=np.uint8))
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._calls += 1
+            self._images += len(crops)
+            self._busy_seconds += elapsed
+        return probabilities
+
+    def stats(self):
+        with self._stats_lock:
+            calls, images, busy = self._calls, self._images, self._busy_seconds
+        return {
+            "backend": self.name,
+            "model_path": self.model_path,
+            "load_ms": self.load_ms,
+            "warmup_ms": self.warmup_ms,
+            "warmup_report": self.warmup_report,
+            "calls": calls,
+            "images": images,
+            "mean_batch_ms": busy * 1000 / calls if calls else 0.0,
+            "images_per_second": images / busy if busy else 0.0,
+        }
+
+    @abstractmethod
+    def _load(self):
+        """Load the model from `self.model_path`."""
+
+    def _prepare(self, batch_sizes):
+        """Hook for backends that allocate per batch size ahead of the timed warm-up calls."""
+
+    @abstractmethod
+    def _predict(self, crops):
+        """Return class probabilities for a batch of uint8 crops."""
+
+
+@register_backend("keras")
+class KerasBackend(InferenceBackend):
+    """Full TensorFlow runtime; the model is wrapped in a tf.function traced once."""
+
+    def _load(self):
+        import tensorflow as tf
+
+        self.model = tf.keras.models.load_model(self.model_path)
+        self._forward = compile_keras_model(self.model)
+
+    def _predict(self, crops):
+        return self._forward(crops)
+
+
+@register_backend("tflite")
+class TFLiteBackend(InferenceBackend):
+    """Exported .tflite model (see export_tflite.py) on the lightweight TFLite interpreter."""
+
+    def _load(self):
+        from tflite_backend import NUM_THREADS, TFLiteClassifier
+
+        self.classifier = TFLiteClassifier(self.model_path, self.num_threads or NUM_THREADS, use_mmap=self.use_mmap)
+
+    def _prepare(self, batch_sizes):
+        self.classifier.prepare(batch_sizes)
+
+    def _predict(self, crops):
+        return self.classifier.predict_probabilities(crops)
+
+
+@register_backend("onnx")
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime on CPU, for a model converted with tf2onnx (float32 NHWC input)."""
+
+    def _load(self):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.session = onnxruntime.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self.session.get_inputs()[0].name
+
+    def _predict(self, crops):
+        return self.session.run(None, {self._input_name: crops.astype(np.float32)})[0]
+
+
+def create_backend(config, warm_up=True):
+    """Build, load and optionally warm up the backend described by a config dict (see config.py)."""
+    backend_name = config.get("backend", "keras")
+    if backend_name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend_name}'; choose from {sorted(BACKENDS)}")
+    model_path = resolve_model_path(config.get("model", "cnn"), backend_name, config.get("model_path"))
+    backend = BACKENDS[backend_name](
+        model_path, num_threads=config.get("num_threads"), use_mmap=config.get("mmap_model", True)
+    )
+    backend.load()
+    if warm_up:
+        backend.warm_up(tuple(config.get("warmup_batch_sizes") or WARMUP_BATCH_SIZES))
+    return backend
@@ -0,0 +1,86 @@
+import cv2
+
+
+PYRAMID_LEVEL = 1
+ROI_PADDING = 0.5
+MIN_FACE_SIZE = 60
+SIZE_TOLERANCE = 0.6
+SCALE_FACTOR = 1.1
+MIN_NEIGHBORS = 5
+
+
+class CascadeFaceDetector:
+    """Haar cascade face detector that searches a padded ROI on a downscaled frame.
+
+    The frame is shrunk `pyramid_level` times with cv2.pyrDown. When a face
+    was found on the previous call only a window around it (padded by
+    `roi_padding` of the face size) is searched, with minSize/maxSize
+    derived from the last face; a full-frame search runs only when that
+    misses. Returned boxes are (x_min, y_min, x_max, y_max) in full-resolution
+    coordinates, largest first.
+    """
+
+    def __init__(self, cascade_path=None, pyramid_level=PYRAMID_LEVEL, roi_padding=ROI_PADDING,
+                 min_face_size=MIN_FACE_SIZE, size_tolerance=SIZE_TOLERANCE):
+        if cascade_path is None:
+            cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        self.pyramid_level = pyramid_level
+        self.roi_padding = roi_padding
+        self.min_face_size = min_face_size
+        self.size_tolerance = size_tolerance
+        self._last_face = None
+        self.roi_hits = 0
+        self.full_searches = 0
+
+    @property
+    def scale(self):
+        return 2 ** self.pyramid_level
+
+    def reset(self):
+        self._last_face = None
+
+    def detect(self, frame):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = gray
+        for _ in range(self.pyramid_level):
+            small = cv2.pyrDown(small)
+
+        faces = []
+        if self._last_face is not None:
+            faces = self._search_roi(small)
+            if faces:
+                self.roi_hits += 1
+        if not faces:
+            self.full_searches += 1
+            min_size = max(1, self.min_face_size // self.scale)
+            faces = self._run_cascade(small, (min_size, min_size))
+
+        faces.sort(key=lambda rect: rect[2] * rect[3], reverse=True)
+        self._last_face = faces[0] if faces else None
+
+        scale = self.scale
+        return [(x * scale, y * scale, (x + w) * scale, (y + h) * scale) for x, y, w, h in faces]
+
+    def _search_roi(self, small):
+        x, y, w, h = self._last_face
+        pad_w = int(w * self.roi_padding)
+        pad_h = int(h * self.roi_padding)
+        img_h, img_w = small.shape[:2]
+        roi_x = max(0, x - pad_w)
+        roi_y = max(0, y - pad_h)
+        roi_x2 = min(img_w, x + w + pad_w)
+        roi_y2 = min(img_h, y + h + pad_h)
+
+        side = max(w, h)
+        min_side = max(1, int(side * self.size_tolerance))
+        max_side = int(side / self.size_tolerance)
+        faces = self._run_cascade(small[roi_y:roi_y2, roi_x:roi_x2], (min_side, min_side), (max_side, max_side))
+        return [(fx + roi_x, fy + roi_y, fw, fh) for fx, fy, fw, fh in faces]
+
+    def _run_cascade(self, image, min_size, max_size=None):
+        kwargs = {"scaleFactor": SCALE_FACTOR, "minNeighbors": MIN_NEIGHBORS, "minSize": min_size}
+        if max_size is not None:
+            kwargs["maxSize"] = max_size
+        faces = self.cascade.detectMultiScale(image, **kwargs)
+        return [tuple(int(v) for v in face) for face in faces]
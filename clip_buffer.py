@@ -0,0 +1,108 @@
+import threading
+from collections import deque
+
+import cv2
+
+
+PRE_EVENT_SECONDS = 5.0
+POST_EVENT_SECONDS = 3.0
+CLIP_FPS = 10.0
+CLIP_FOURCC = "MJPG"
+JPEG_QUALITY = 80
+CLIP_EXTENSION = ".avi"
+
+
+class _PendingClip:
+    def __init__(self, path, end_time, frames):
+        self.path = path
+        self.end_time = end_time
+        self.frames = frames
+
+
+class ClipBuffer:
+    """In-memory ring of recorded frames that saves short evidence clips around events.
+
+    The ring holds references to the frames the recorder already has, for
+    the last `pre_seconds`, so nothing is encoded unless an event happens.
+    `trigger` starts a clip covering `pre_seconds` before and `post_seconds`
+    after the event; triggers that land inside an open clip extend it
+    instead of starting a new one. A finished clip is encoded once as MJPG
+    in an AVI at `fps`, with frames placed by capture time like the main
+    recording, so it plays at the right speed in ordinary players.
+    """
+
+    def __init__(self, pre_seconds=PRE_EVENT_SECONDS, post_seconds=POST_EVENT_SECONDS, fps=CLIP_FPS,
+                 jpeg_quality=JPEG_QUALITY):
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+        self._frames = deque()
+        self._pending = []
+        self._lock = threading.Lock()
+        self.clips_written = 0
+
+    def add(self, timestamp, frame):
+        """Keep a recorded frame in the ring and append it to any open clips; the frame must not be modified later."""
+        entry = (timestamp, frame)
+
+        with self._lock:
+            self._frames.append(entry)
+            while self._frames and self._frames[0][0] < timestamp - self.pre_seconds:
+                self._frames.popleft()
+
+            for clip in self._pending:
+                clip.frames.append(entry)
+            finished = [clip for clip in self._pending if timestamp >= clip.end_time]
+            self._pending = [clip for clip in self._pending if timestamp < clip.end_time]
+
+        for clip in finished:
+            self._write(clip)
+
+    def trigger(self, event_time, clip_path):
+        """Request a clip around `event_time`; returns the path the clip will be saved to."""
+        with self._lock:
+            for clip in self._pending:
+                if event_time <= clip.end_time:
+                    clip.end_time = max(clip.end_time, event_time + self.post_seconds)
+                    return clip.path
+
+            frames = [entry for entry in self._frames if entry[0] >= event_time - self.pre_seconds]
+            self._pending.append(_PendingClip(clip_path, event_time + self.post_seconds, frames))
+            return clip_path
+
+    def flush(self):
+        """Write every open clip with the frames collected so far, e.g. when recording stops."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for clip in pending:
+            self._write(clip)
+
+    def _write(self, clip):
+        if not clip.frames:
+            return
+        height, width = clip.frames[0][1].shape[:2]
+        writer = cv2.VideoWriter(clip.path, cv2.VideoWriter_fourcc(*CLIP_FOURCC), self.fps, (width, height))
+        if not writer.isOpened():
+            print(f"Cannot write evidence clip {clip.path}")
+            return
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.jpeg_quality)
+        start_time = clip.frames[0][0]
+        frames_written = 0
+        last_frame = None
+        try:
+            # Same constant-rate placement as Recorder: repeat a frame across capture gaps, drop surplus frames.
+            for timestamp, frame in clip.frames:
+                target_index = int(round((timestamp - start_time) * self.fps))
+                if target_index < frames_written:
+                    continue
+                while last_frame is not None and frames_written < target_index:
+                    writer.write(last_frame)
+                    frames_written += 1
+                writer.write(frame)
+                frames_written += 1
+                last_frame = frame
+        finally:
+            writer.release()
+        self.clips_written += 1
+        print(f"Evidence clip saved: {clip.path}")
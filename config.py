@@ -0,0 +1,41 @@
+import json
+import os
+
+
+CONFIG_PATH = os.environ.get("EPA_CONFIG", "epa_config.json")
+
+DEFAULT_CONFIG = {
+    # Inference: "model" is a key of backends.MODEL_PATHS, "backend" one of "keras", "tflite", "onnx";
+    # "model_path" overrides the default file for that pair and is required for any other model.
+    "model": "cnn",
+    "backend": "keras",
+    "model_path": None,
+    "num_threads": 2,
+    # Batch sizes run through the model before the first session; None means every size up to MAX_BATCH_SIZE.
+    "warmup_batch_sizes": None,
+    # "frame" decides on every crop through the smoother; "sequence" decides on windows of crops
+    # (see sequence_inference.py). Used by the single-camera proctoring page.
+    "inference_mode": "frame",
+    # TFLite only: build the interpreter from the mapped file so processes share its pages.
+    "mmap_model": True,
+    # Multi-camera page: camera indices, stream URLs or video files, one grid cell each.
+    "camera_sources": [0],
+    # proctoring_worker.py listens here; set worker_url (e.g. "http://127.0.0.1:8765") to make the
+    # multi-camera page a thin client of a running worker instead of loading the model itself
+    # (the single-camera proctoring page always runs in-process).
+    "worker_host": "127.0.0.1",
+    "worker_port": 8765,
+    "worker_url": None,
+    # Name of a recorder.RECORDING_PROFILES entry, or a dict such as {"base": "xvid", "fps": 5.0} overriding
+    # some of its fields ("fourcc", "container", "frame_size", "fps", "quality").
+    "recording_profile": "xvid",
+}
+
+
+def load_config(path=CONFIG_PATH):
+    """Return DEFAULT_CONFIG overlaid with the deployment's JSON config file, if it exists."""
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, "r") as config_file:
+            config.update(json.load(config_file))
+    return config
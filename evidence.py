@@ -0,0 +1,110 @@
+import heapq
+import threading
+
+import cv2
+import numpy as np
+
+
+FRAME_SIZE = (640, 480)
+TOP_VIOLATIONS = 5
+RING_SECONDS = 10
+RING_FPS = 2
+
+
+class KeyframeStore:
+    """Fixed-size evidence frames for one session, kept in a single preallocated buffer.
+
+    Slot 0 holds the first "Allowed" frame, the next `top_k` slots hold the
+    most confident "Not Allowed" frames, and the rest form a ring buffer
+    of the last `ring_seconds` sampled at `ring_fps`. Memory is allocated
+    once up front and does not grow with session length.
+    """
+
+    def __init__(self, frame_size=FRAME_SIZE, top_k=TOP_VIOLATIONS, ring_seconds=RING_SECONDS, ring_fps=RING_FPS):
+        width, height = frame_size
+        self.frame_size = frame_size
+        self.top_k = top_k
+        self.ring_size = max(1, int(ring_seconds * ring_fps))
+        self.ring_interval = 1.0 / ring_fps
+
+        self._frames = np.zeros((1 + top_k + self.ring_size, height, width, 3), dtype=np.uint8)
+        self._lock = threading.Lock()
+
+        self._first_allowed = None
+        # Min-heap of (confidence, timestamp, slot) so the weakest violation is evicted first.
+        self._violations = []
+        self._free_violation_slots = list(range(top_k, 0, -1))
+        self._ring = []
+        self._ring_next = 0
+        self._last_ring_time = None
+
+    @property
+    def nbytes(self):
+        return self._frames.nbytes
+
+    def _store(self, slot, frame):
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            cv2.resize(frame, self.frame_size, dst=self._frames[slot])
+        else:
+            np.copyto(self._frames[slot], frame)
+
+    def add(self, frame, label, confidence, timestamp):
+        """Offer an annotated frame; it is copied only if it earns a slot. Use label None for no-face frames."""
+        with self._lock:
+            if label == "Allowed":
+                if self._first_allowed is None:
+                    self._store(0, frame)
+                    self._first_allowed = (confidence, timestamp, 0)
+            elif label == "Not Allowed":
+                self._add_violation(frame, confidence, timestamp)
+
+            if self._last_ring_time is None or timestamp - self._last_ring_time >= self.ring_interval:
+                self._add_to_ring(frame, label, confidence, timestamp)
+
+    def _add_violation(self, frame, confidence, timestamp):
+        if self._free_violation_slots:
+            slot = self._free_violation_slots.pop()
+        elif self.top_k and confidence > self._violations[0][0]:
+            slot = heapq.heappop(self._violations)[2]
+        else:
+            return
+        self._store(slot, frame)
+        heapq.heappush(self._violations, (confidence, timestamp, slot))
+
+    def _add_to_ring(self, frame, label, confidence, timestamp):
+        slot = 1 + self.top_k + self._ring_next
+        self._store(slot, frame)
+        entry = (timestamp, label, confidence, slot)
+        if len(self._ring) < self.ring_size:
+            self._ring.append(entry)
+        else:
+            self._ring[self._ring_next] = entry
+        self._ring_next = (self._ring_next + 1) % self.ring_size
+        self._last_ring_time = timestamp
+
+    def first_allowed(self):
+        with self._lock:
+            if self._first_allowed is None:
+                return None
+            return self._frames[0].copy()
+
+    def top_violations(self):
+        """Return [(confidence, timestamp, frame)] for the kept violations, most confident first."""
+        with self._lock:
+            ranked = sorted(self._violations, reverse=True)
+            return [(confidence, timestamp, self._frames[slot].copy()) for confidence, timestamp, slot in ranked]
+
+    def best_violation(self):
+        violations = self.top_violations()
+        return violations[0][2] if violations else None
+
+    def has_violation(self):
+        with self._lock:
+            return bool(self._violations)
+
+    def recent(self):
+        """Return [(timestamp, label, confidence, frame)] from the ring buffer, oldest first."""
+        with self._lock:
+            ordered = sorted(self._ring)
+            return [(timestamp, label, confidence, self._frames[slot].copy())
+                    for timestamp, label, confidence, slot in ordered]
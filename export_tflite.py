@@ -0,0 +1,155 @@
+"""Export CNN_Model2 to a quantized TFLite model (and optionally ONNX) and compare it with the Keras model.
+
+    python export_tflite.py --quantization float16
+    python export_tflite.py --quantization int8 --calibration-dir face_crops/ --report
+    python export_tflite.py --onnx              # also write CNN_Model2.onnx for the "onnx" backend (needs tf2onnx)
+
+Calibration and evaluation images are 128x128 face crops. When the
+directory has one sub-folder per class (the layout the notebooks train
+from), the report also includes accuracy against those labels.
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+from inference_engine import CLASS_LABELS, INPUT_SIZE, compile_keras_model
+from backends import MODEL_PATHS
+from tflite_backend import TFLiteClassifier
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+CALIBRATION_SAMPLES = 200
+REPORT_RUNS = 50
+ONNX_OPSET = 13
+
+
+def load_face_crops(directory, limit=None):
+    """Return (crops, labels) from a folder of images; labels are class indices or None if unlabelled."""
+    crops, labels = [], []
+    for current_dir, _, filenames in sorted(os.walk(directory)):
+        class_name = os.path.basename(current_dir)
+        label = CLASS_LABELS.index(class_name) if class_name in CLASS_LABELS else None
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            image = cv2.imread(os.path.join(current_dir, filename))
+            if image is None:
+                continue
+            crops.append(cv2.resize(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), INPUT_SIZE))
+            labels.append(label)
+            if limit is not None and len(crops) >= limit:
+                return np.stack(crops), labels
+    if not crops:
+        raise ValueError(f"No images found in {directory}")
+    return np.stack(crops), labels
+
+
+def convert(model, quantization, calibration_crops=None):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == "int8":
+        if calibration_crops is None:
+            raise ValueError("int8 quantization needs --calibration-dir")
+
+        def representative_dataset():
+            for crop in calibration_crops:
+                yield [crop[np.newaxis].astype(np.float32)]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    elif quantization != "none":
+        raise ValueError(f"Unknown quantization: {quantization}")
+    return converter.convert()
+
+
+def export_onnx(model, output_path, opset=ONNX_OPSET):
+    """Convert the Keras model to ONNX with a float32 NHWC input, as backends.OnnxBackend expects."""
+    import tf2onnx
+
+    input_signature = (tf.TensorSpec((None, *INPUT_SIZE, 3), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=opset, output_path=output_path)
+
+
+def time_per_inference(predict_fn, crops, runs):
+    predict_fn(crops[:1])
+    started = time.perf_counter()
+    for i in range(runs):
+        predict_fn(crops[i % len(crops):i % len(crops) + 1])
+    return (time.perf_counter() - started) * 1000 / runs
+
+
+def report(keras_path, tflite_path, crops, labels, runs):
+    started = time.perf_counter()
+    keras_model = tf.keras.models.load_model(keras_path)
+    keras_load_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    tflite_model = TFLiteClassifier(tflite_path)
+    tflite_load_ms = (time.perf_counter() - started) * 1000
+
+    keras_predict = compile_keras_model(keras_model)
+    keras_probs = keras_predict(crops)
+    tflite_probs = tflite_model.predict_probabilities(crops)
+    keras_classes = keras_probs.argmax(axis=1)
+    tflite_classes = tflite_probs.argmax(axis=1)
+
+    rows = [
+        ("file size (MB)", os.path.getsize(keras_path) / 1e6, os.path.getsize(tflite_path) / 1e6),
+        ("load time (ms)", keras_load_ms, tflite_load_ms),
+        ("latency, batch of 1 (ms)",
+         time_per_inference(keras_predict, crops, runs),
+         time_per_inference(tflite_model.predict_probabilities, crops, runs)),
+    ]
+    known = [i for i, label in enumerate(labels) if label is not None]
+    if known:
+        truth = np.array([labels[i] for i in known])
+        rows.append(("accuracy (%)",
+                     100 * float((keras_classes[known] == truth).mean()),
+                     100 * float((tflite_classes[known] == truth).mean())))
+
+    print(f"{'':28}{'keras':>12}{'tflite':>12}")
+    for name, keras_value, tflite_value in rows:
+        print(f"{name:28}{keras_value:12.2f}{tflite_value:12.2f}")
+    print(f"top-1 agreement with keras: {100 * float((keras_classes == tflite_classes).mean()):.2f}%")
+    print(f"max probability difference: {float(np.abs(keras_probs - tflite_probs).max()):.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=MODEL_PATHS["cnn"]["keras"], help="Keras model to export")
+    parser.add_argument("--output", default=MODEL_PATHS["cnn"]["tflite"], help="where to write the .tflite file")
+    parser.add_argument("--quantization", choices=("none", "float16", "int8"), default="float16")
+    parser.add_argument("--onnx", action="store_true", help="also export an ONNX model with tf2onnx")
+    parser.add_argument("--onnx-output", default=MODEL_PATHS["cnn"]["onnx"], help="where to write the .onnx file")
+    parser.add_argument("--calibration-dir", default=None, help="folder of 128x128 face crops")
+    parser.add_argument("--calibration-samples", type=int, default=CALIBRATION_SAMPLES)
+    parser.add_argument("--report", action="store_true", help="compare accuracy and latency with the Keras model")
+    parser.add_argument("--runs", type=int, default=REPORT_RUNS, help="timed inferences per model in the report")
+    args = parser.parse_args()
+
+    crops, labels = (load_face_crops(args.calibration_dir, args.calibration_samples)
+                     if args.calibration_dir else (None, []))
+
+    model = tf.keras.models.load_model(args.model)
+    tflite_model = convert(model, args.quantization, crops)
+    with open(args.output, "wb") as output_file:
+        output_file.write(tflite_model)
+    print(f"Saved {args.quantization} TFLite model to {args.output} ({len(tflite_model) / 1e6:.2f} MB)")
+    if args.onnx:
+        export_onnx(model, args.onnx_output)
+        print(f"Saved ONNX model to {args.onnx_output} ({os.path.getsize(args.onnx_output) / 1e6:.2f} MB)")
+
+    if args.report:
+        if crops is None:
+            parser.error("--report needs --calibration-dir")
+        report(args.model, args.output, crops, labels, args.runs)
+
+
+if __name__ == "__main__":
+    main()
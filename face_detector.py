@@ -0,0 +1,97 @@
+import threading
+
+import numpy as np
+import mediapipe as mp
+
+
+mp_face_detection = mp.solutions.face_detection
+
+MIN_DETECTION_CONFIDENCE = 0.5
+MODEL_SELECTION = 0
+
+
+class FaceDetector:
+    """Long-lived MediaPipe face detector owned by a proctoring session.
+
+    The TFLite graph is built once in `start` and reused for every frame.
+    Face detection keeps no state between frames, so the same graph serves
+    live streams and unrelated images such as sampled recording frames.
+    """
+
+    def __init__(self, min_detection_confidence=MIN_DETECTION_CONFIDENCE,
+                 model_selection=MODEL_SELECTION):
+        self.min_detection_confidence = min_detection_confidence
+        self.model_selection = model_selection
+        self._detection = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return self._detection is not None
+
+    def start(self):
+        """Build the detection graph if it is not already running."""
+        with self._lock:
+            if self._detection is None:
+                self._detection = mp_face_detection.FaceDetection(
+                    min_detection_confidence=self.min_detection_confidence,
+                    model_selection=self.model_selection,
+                )
+
+    def warm_up(self, frame_shape=(480, 640, 3)):
+        """Run one blank frame through the graph so the first camera frame is not the slow one."""
+        self.start()
+        self.detect(np.zeros(frame_shape, dtype=np.uint8))
+        with self._lock:
+            self._detection.reset()
+
+    def stop(self):
+        """Tear down the detection graph and free its resources."""
+        with self._lock:
+            if self._detection is not None:
+                self._detection.close()
+                self._detection = None
+
+    def reconfigure(self, min_detection_confidence=None, model_selection=None):
+        """Change detector settings, rebuilding the graph only when it is required."""
+        rebuild = False
+        with self._lock:
+            if min_detection_confidence is not None and min_detection_confidence != self.min_detection_confidence:
+                self.min_detection_confidence = min_detection_confidence
+                rebuild = True
+            if model_selection is not None and model_selection != self.model_selection:
+                self.model_selection = model_selection
+                rebuild = True
+            running = self._detection is not None
+
+        if rebuild and running:
+            self.stop()
+            self.start()
+
+    def detect(self, rgb_frame):
+        """Return pixel bounding boxes (x_min, y_min, x_max, y_max) for every face in an RGB frame."""
+        with self._lock:
+            if self._detection is None:
+                raise RuntimeError("FaceDetector.detect called before start()")
+            results = self._detection.process(rgb_frame)
+
+        if not results.detections:
+            return []
+
+        h, w, _ = rgb_frame.shape
+        boxes = []
+        for detection in results.detections:
+            bboxC = detection.location_data.relative_bounding_box
+            x_min = int(bboxC.xmin * w)
+            y_min = int(bboxC.ymin * h)
+            x_max = int((bboxC.xmin + bboxC.width) * w)
+            y_max = int((bboxC.ymin + bboxC.height) * h)
+            boxes.append((x_min, y_min, x_max, y_max))
+        return boxes
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
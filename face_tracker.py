@@ -0,0 +1,173 @@
+import cv2
+import numpy as np
+
+
+REDETECT_INTERVAL = 10
+MIN_TRACKING_CONFIDENCE = 0.6
+BOX_SMOOTHING = 0.5
+# KCF is several times cheaper per frame than CSRT and the detector corrects its drift every few frames;
+# pass "csrt" in tracker_preference to trade that speed for tighter boxes.
+TRACKER_PREFERENCE = ("kcf", "flow")
+
+FLOW_MAX_POINTS = 40
+FLOW_MAX_FB_ERROR = 1.5
+GRAY_CONVERSIONS = {"bgr": cv2.COLOR_BGR2GRAY, "rgb": cv2.COLOR_RGB2GRAY}
+
+
+def _opencv_tracker_factory(name):
+    """Return the CSRT/KCF constructor from cv2 or cv2.legacy, or None if this OpenCV build lacks it."""
+    factory_name = f"Tracker{name.upper()}_create"
+    for namespace in (cv2, getattr(cv2, "legacy", None)):
+        factory = getattr(namespace, factory_name, None) if namespace is not None else None
+        if factory is not None:
+            return factory
+    return None
+
+
+class OpenCVBoxTracker:
+    """Adapter around an OpenCV single-object tracker (CSRT or KCF)."""
+
+    def __init__(self, name):
+        self.name = name
+        self._tracker = None
+
+    def init(self, frame, box):
+        x_min, y_min, x_max, y_max = box
+        self._tracker = _opencv_tracker_factory(self.name)()
+        self._tracker.init(frame, (x_min, y_min, x_max - x_min, y_max - y_min))
+
+    def update(self, frame):
+        ok, (x, y, w, h) = self._tracker.update(frame)
+        if not ok:
+            return None, 0.0
+        return (int(x), int(y), int(x + w), int(y + h)), 1.0
+
+
+class OpticalFlowBoxTracker:
+    """Tracks a box by following corner features with pyramidal Lucas-Kanade flow.
+
+    Confidence is the fraction of points that survive a forward-backward check.
+    `color_order` ("bgr" or "rgb") is the channel order of colour frames.
+    """
+
+    name = "flow"
+
+    def __init__(self, color_order="bgr"):
+        self._gray_conversion = GRAY_CONVERSIONS[color_order]
+        self._prev_gray = None
+        self._points = None
+        self._box = None
+
+    def _to_gray(self, frame):
+        return frame if frame.ndim == 2 else cv2.cvtColor(frame, self._gray_conversion)
+
+    def init(self, frame, box):
+        gray = self._to_gray(frame)
+        x_min, y_min, x_max, y_max = box
+        mask = np.zeros_like(gray)
+        mask[y_min:y_max, x_min:x_max] = 255
+        self._points = cv2.goodFeaturesToTrack(gray, FLOW_MAX_POINTS, 0.01, 5, mask=mask)
+        self._prev_gray = gray
+        self._box = np.array(box, dtype=np.float32)
+
+    def update(self, frame):
+        if self._points is None or len(self._points) == 0:
+            return None, 0.0
+
+        gray = self._to_gray(frame)
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, self._points, None)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, next_points, None)
+        fb_error = np.linalg.norm((self._points - back_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < FLOW_MAX_FB_ERROR)
+
+        confidence = float(good.sum()) / len(self._points)
+        if good.sum() < 3:
+            return None, confidence
+
+        shift = np.median((next_points - self._points).reshape(-1, 2)[good], axis=0)
+        self._box += np.array([shift[0], shift[1], shift[0], shift[1]], dtype=np.float32)
+        self._points = next_points[good].reshape(-1, 1, 2)
+        self._prev_gray = gray
+        return tuple(int(v) for v in self._box), confidence
+
+
+def create_box_tracker(preference=TRACKER_PREFERENCE, color_order="bgr"):
+    """Return the first available tracker in `preference` order."""
+    for name in preference:
+        if name == "flow":
+            return OpticalFlowBoxTracker(color_order)
+        if _opencv_tracker_factory(name) is not None:
+            return OpenCVBoxTracker(name)
+    return OpticalFlowBoxTracker(color_order)
+
+
+class FaceTracker:
+    """Detect-then-track wrapper around an expensive face detector.
+
+    `detect_fn(frame)` returns face boxes as (x_min, y_min, x_max, y_max).
+    The detector runs every `redetect_interval` frames, or sooner when the
+    tracker loses the face or its confidence drops below
+    `min_tracking_confidence`; the frames in between only run the tracker.
+    `color_order` ("bgr" or "rgb") is the channel order of the frames passed to `update`.
+    """
+
+    def __init__(self, detect_fn, redetect_interval=REDETECT_INTERVAL,
+                 min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
+                 smoothing=BOX_SMOOTHING, tracker_preference=TRACKER_PREFERENCE, color_order="bgr"):
+        self.detect_fn = detect_fn
+        self.color_order = color_order
+        self.redetect_interval = redetect_interval
+        self.min_tracking_confidence = min_tracking_confidence
+        self.smoothing = smoothing
+        self.tracker_preference = tracker_preference
+
+        self._tracker = None
+        self._box = None
+        self._frames_since_detection = 0
+        self.detections_run = 0
+        self.frames_tracked = 0
+
+    def reset(self):
+        self._tracker = None
+        self._box = None
+        self._frames_since_detection = 0
+
+    def update(self, frame):
+        """Return the face box for this frame, or None when no face is found."""
+        if self._tracker is not None and self._frames_since_detection < self.redetect_interval:
+            box, confidence = self._tracker.update(frame)
+            if box is not None and confidence >= self.min_tracking_confidence:
+                self._frames_since_detection += 1
+                self.frames_tracked += 1
+                return self._smooth(self._clip(box, frame))
+
+        return self._detect(frame)
+
+    def _detect(self, frame):
+        self.detections_run += 1
+        boxes = self.detect_fn(frame)
+        if not boxes:
+            self.reset()
+            return None
+
+        box = self._clip(boxes[0], frame)
+        self._tracker = create_box_tracker(self.tracker_preference, self.color_order)
+        self._tracker.init(frame, box)
+        self._frames_since_detection = 0
+        return self._smooth(box)
+
+    def _smooth(self, box):
+        if self._box is None or self.smoothing <= 0:
+            self._box = box
+        else:
+            self._box = tuple(
+                int(self.smoothing * previous + (1 - self.smoothing) * current)
+                for previous, current in zip(self._box, box)
+            )
+        return self._box
+
+    @staticmethod
+    def _clip(box, frame):
+        h, w = frame.shape[:2]
+        x_min, y_min, x_max, y_max = box
+        return (max(0, x_min), max(0, y_min), min(w, x_max), min(h, y_max))
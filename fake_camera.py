@@ -0,0 +1,53 @@
+import time
+
+import cv2
+
+from recorder import RECORDING_FPS
+
+
+FAKE_CAMERA_PREFIX = "fake:"
+
+
+class FakeCamera:
+    """Stand-in for cv2.VideoCapture that replays a video file at its own frame rate.
+
+    Lets the worker and the multi-camera page be exercised locally without
+    webcams: use a source such as "fake:recordings/proctoring_1700000000.avi".
+    With `loop=True` the file restarts when it ends; otherwise the camera
+    closes, which ends the capture pipeline like an unplugged device.
+    """
+
+    def __init__(self, path, fps=None, loop=True):
+        self.path = path
+        self.loop = loop
+        self._cap = cv2.VideoCapture(path)
+        self.fps = fps or self._cap.get(cv2.CAP_PROP_FPS) or RECORDING_FPS
+        self._next_frame_time = None
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def read(self):
+        now = time.time()
+        if self._next_frame_time is not None and now < self._next_frame_time:
+            time.sleep(self._next_frame_time - now)
+        # Pace from the schedule, not from when read() was called, but never try to catch up a backlog.
+        self._next_frame_time = max(self._next_frame_time or now, time.time() - 1 / self.fps) + 1 / self.fps
+
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        if not ret:
+            self._cap.release()
+        return ret, frame
+
+    def release(self):
+        self._cap.release()
+
+
+def open_capture(source):
+    """cv2.VideoCapture for a camera index, stream URL or file; FakeCamera for "fake:<video file>"."""
+    if isinstance(source, str) and source.startswith(FAKE_CAMERA_PREFIX):
+        return FakeCamera(source[len(FAKE_CAMERA_PREFIX):])
+    return cv2.VideoCapture(source)
@@ -0,0 +1,104 @@
+ENTER_THRESHOLD = 0.5
+EXIT_THRESHOLD = 0.5
+MIN_DURATION = 1.0
+RELEASE_SECONDS = 2.0
+
+
+class Incident:
+    """One continuous episode of a per-frame signal, e.g. a run of "Not Allowed" frames."""
+
+    def __init__(self, kind, start, score, bbox=None):
+        self.kind = kind
+        self.start = start
+        self.end = start
+        self.peak_score = score
+        self.peak_bbox = bbox
+        self.frame_count = 1
+        self.evidence_path = None
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def extend(self, timestamp, score, bbox=None):
+        self.end = timestamp
+        self.frame_count += 1
+        if score > self.peak_score:
+            self.peak_score = score
+            self.peak_bbox = bbox
+
+    def __repr__(self):
+        return (f"Incident({self.kind!r}, start={self.start:.2f}, duration={self.duration:.2f}s, "
+                f"peak={self.peak_score:.2f}, frames={self.frame_count})")
+
+
+class IncidentEngine:
+    """Turns a per-frame score stream into timed incidents using hysteresis.
+
+    A frame is active once its score reaches `enter_threshold` and stays
+    active while it is at least `exit_threshold`. An incident is confirmed
+    only after `min_duration` seconds of activity, and it closes once the
+    signal has been inactive for `release_seconds`. `on_start(incident)` fires
+    once when an incident is confirmed and `on_end(incident)` once when it
+    closes, instead of once per frame.
+    """
+
+    def __init__(self, kind, on_start=None, on_end=None, enter_threshold=ENTER_THRESHOLD,
+                 exit_threshold=EXIT_THRESHOLD, min_duration=MIN_DURATION, release_seconds=RELEASE_SECONDS):
+        self.kind = kind
+        self.on_start = on_start
+        self.on_end = on_end
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.min_duration = min_duration
+        self.release_seconds = release_seconds
+
+        self._candidate = None
+        self._confirmed = False
+        self._last_active = None
+        self.incidents = 0
+
+    @property
+    def active_incident(self):
+        return self._candidate if self._confirmed else None
+
+    def update(self, timestamp, score, bbox=None):
+        """Feed one frame's score; returns the Incident that closed on this frame, if any."""
+        threshold = self.exit_threshold if self._candidate is not None else self.enter_threshold
+        if score >= threshold:
+            self._last_active = timestamp
+            if self._candidate is None:
+                self._candidate = Incident(self.kind, timestamp, score, bbox)
+            else:
+                self._candidate.extend(timestamp, score, bbox)
+            if not self._confirmed and self._candidate.duration >= self.min_duration:
+                self._confirmed = True
+                self.incidents += 1
+                if self.on_start is not None:
+                    self.on_start(self._candidate)
+            return None
+
+        if self._candidate is None:
+            return None
+        if not self._confirmed:
+            # Too short to count as an incident; forget it.
+            self._candidate = None
+            return None
+        if timestamp - self._last_active >= self.release_seconds:
+            return self._close()
+        return None
+
+    def close(self):
+        """Close any confirmed incident at the end of a session and return it."""
+        if self._confirmed:
+            return self._close()
+        self._candidate = None
+        return None
+
+    def _close(self):
+        incident = self._candidate
+        self._candidate = None
+        self._confirmed = False
+        if self.on_end is not None:
+            self.on_end(incident)
+        return incident
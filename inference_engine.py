@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+CLASS_LABELS = ["Allowed", "Not Allowed"]
+INPUT_SIZE = (128, 128)
+MAX_BATCH_SIZE = 8
+BATCH_WINDOW_MS = 5
+# A source that has not submitted for this long no longer counts as one to wait for.
+SOURCE_IDLE_SECONDS = 1.0
+LATENCY_HISTORY = 200
+
+
+def compile_keras_model(model):
+    """Wrap a Keras model in a tf.function traced once for uint8 crop batches; returns crops -> probabilities."""
+    import tensorflow as tf
+
+    height, width = INPUT_SIZE
+
+    @tf.function(input_signature=[tf.TensorSpec(shape=(None, height, width, 3), dtype=tf.uint8)])
+    def forward(crops):
+        return model(tf.cast(crops, tf.float32), training=False)
+
+    return lambda crops: forward(tf.convert_to_tensor(crops, dtype=tf.uint8)).numpy()
+
+
+class InferenceEngine:
+    """Micro-batching front end for an inference backend from backends.py.
+
+    Face crops are queued with `submit`; a worker thread groups whatever
+    arrives within `batch_window_ms` (up to `max_batch_size` crops) into one
+    call of the backend's `predict_batch` and resolves each crop's Future
+    with a `(label, confidence)` pair.
+
+    Each `source` (e.g. one camera) has its own queue and batches are
+    filled round-robin across sources, so several streams share every
+    batch and a fast stream cannot starve a slow one. The window only waits
+    for sources active in the last SOURCE_IDLE_SECONDS that have nothing
+    queued yet, so a single stream is dispatched at once.
+    """
+
+    def __init__(self, backend, max_batch_size=MAX_BATCH_SIZE, batch_window_ms=BATCH_WINDOW_MS):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self._predict_fn = backend.predict_batch
+
+        # source -> deque of (crop, future); sources served least recently come first.
+        self._pending = OrderedDict()
+        self._pending_count = 0
+        # source -> time of its latest submit
+        self._last_submit = {}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._worker = None
+        self._latency_lock = threading.Lock()
+        self.batch_latencies = []
+        self.first_batch_ms = None
+
+    def start(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._batch_loop, name="inference", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, crop, source=None):
+        """Queue one 128x128 RGB crop from `source` and return a Future for its (label, confidence)."""
+        future = Future()
+        with self._condition:
+            self._pending.setdefault(source, deque()).append((crop, future))
+            self._pending_count += 1
+            self._last_submit[source] = time.perf_counter()
+            self._condition.notify()
+        return future
+
+    def predict(self, crop, source=None):
+        """Blocking helper that classifies a single crop through the batcher."""
+        return self.submit(crop, source).result()
+
+    def predict_batch(self, crops):
+        """Run the backend on a stacked batch and return (label, confidence) per crop."""
+        started = time.perf_counter()
+        probabilities = self._predict_fn(crops)
+        self._record_latency(len(crops), time.perf_counter() - started)
+
+        results = []
+        for row in probabilities:
+            class_index = int(np.argmax(row))
+            results.append((CLASS_LABELS[class_index], float(row[class_index]) * 100))
+        return results
+
+    def _waiting_for_sources(self):
+        """True while a recently active source has nothing queued. Caller holds the condition."""
+        idle_before = time.perf_counter() - SOURCE_IDLE_SECONDS
+        for source, submitted_at in list(self._last_submit.items()):
+            if submitted_at < idle_before:
+                del self._last_submit[source]
+        return len(self._pending) < len(self._last_submit)
+
+    def _take_round_robin(self):
+        """Pop up to max_batch_size requests, one per source in turn. Caller holds the condition."""
+        batch = []
+        while self._pending and len(batch) < self.max_batch_size:
+            for source in list(self._pending):
+                if len(batch) >= self.max_batch_size:
+                    break
+                requests = self._pending[source]
+                batch.append(requests.popleft())
+                if requests:
+                    self._pending.move_to_end(source)
+                else:
+                    del self._pending[source]
+        self._pending_count -= len(batch)
+        return batch
+
+    def _batch_loop(self):
+        while not self._stop_event.is_set():
+            with self._condition:
+                if not self._pending_count:
+                    self._condition.wait(timeout=0.1)
+                if not self._pending_count:
+                    continue
+                deadline = time.perf_counter() + self.batch_window
+                while self._pending_count < self.max_batch_size and self._waiting_for_sources():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                batch = self._take_round_robin()
+
+            crops = np.stack([crop for crop, _ in batch])
+            try:
+                results = self.predict_batch(crops)
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _record_latency(self, batch_size, seconds):
+        with self._latency_lock:
+            if self.first_batch_ms is None:
+                self.first_batch_ms = seconds * 1000
+            self.batch_latencies.append((batch_size, seconds * 1000))
+            if len(self.batch_latencies) > LATENCY_HISTORY:
+                del self.batch_latencies[0]
+
+    def latency_report(self):
+        """Summarise recent batches: count, mean batch size, first, mean and p95 latency in ms."""
+        with self._latency_lock:
+            history = list(self.batch_latencies)
+            first_ms = self.first_batch_ms
+        if not history:
+            return {"batches": 0, "mean_batch_size": 0.0, "first_ms": 0.0, "mean_ms": 0.0, "p95_ms": 0.0}
+
+        sizes = np.array([size for size, _ in history])
+        latencies = np.array([latency for _, latency in history])
+        return {
+            "batches": len(history),
+            "mean_batch_size": float(sizes.mean()),
+            "first_ms": first_ms,
+            "mean_ms": float(latencies.mean()),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        }
@@ -1,5 +1,5 @@
 from tkinter import Label, Button
-from proctoring import ProctoringApp
+import model_loader
 from recordings import RecordingsPage
 from alerts import AlertsPage
 from login_signup import LoginSignupApp
@@ -14,12 +14,13 @@ class MenuPage:
         self.root.geometry("800x600")
         self.root.configure(bg="#1E1F3B")
 
+        model_loader.load_in_background()
         self.show_menu()
 
     def show_menu(self):
         self.clear_frame()
 
-        for i in range(7):  
+        for i in range(9):  
             self.root.grid_rowconfigure(i, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
 
@@ -57,6 +58,16 @@ class MenuPage:
         )
         proctoring_button.grid(row=2, column=0, pady=10, sticky="n")
 
+        multi_camera_button = Button(
+            self.root,
+            text="Multi-Camera",
+            command=self.open_multi_camera,
+            bg="#3AA17E",
+            activebackground="#2F8764",
+            **button_options,
+        )
+        multi_camera_button.grid(row=3, column=0, pady=10, sticky="n")
+
         recordings_button = Button(
             self.root,
             text="Recordings",
@@ -65,7 +76,7 @@ class MenuPage:
             activebackground="#2F5487",
             **button_options,
         )
-        recordings_button.grid(row=3, column=0, pady=10, sticky="n")
+        recordings_button.grid(row=4, column=0, pady=10, sticky="n")
 
         alerts_button = Button(
             self.root,
@@ -75,7 +86,7 @@ class MenuPage:
             activebackground="#D97A33",
             **button_options,
         )
-        alerts_button.grid(row=4, column=0, pady=10, sticky="n")
+        alerts_button.grid(row=5, column=0, pady=10, sticky="n")
 
         change_password_button = Button(
             self.root,
@@ -85,7 +96,7 @@ class MenuPage:
             activebackground="#FFB300",
             **button_options,
         )
-        change_password_button.grid(row=5, column=0, pady=10, sticky="n")
+        change_password_button.grid(row=6, column=0, pady=10, sticky="n")
 
         logout_button = Button(
             self.root,
@@ -95,12 +106,43 @@ class MenuPage:
             activebackground="#C64540",
             **button_options,
         )
-        logout_button.grid(row=6, column=0, pady=20, sticky="n")
+        logout_button.grid(row=7, column=0, pady=20, sticky="n")
+
+        self.model_status_label = Label(
+            self.root,
+            text="",
+            bg="#1E1F3B",
+            fg="#B3B6D3",
+            font=("Helvetica", 10),
+        )
+        self.model_status_label.grid(row=8, column=0, pady=5, sticky="n")
+        self.update_model_status()
+
+    def update_model_status(self):
+        """Show whether the proctoring model has finished loading in the background."""
+        if not self.model_status_label.winfo_exists():
+            return
+        status = model_loader.status()
+        if status == model_loader.STATUS_READY:
+            self.model_status_label.config(text="Proctoring model ready", fg="#3AA17E")
+        elif status == model_loader.STATUS_FAILED:
+            self.model_status_label.config(text="Proctoring model failed to load", fg="#D9534F")
+        else:
+            self.model_status_label.config(text="Loading proctoring model...")
+            self.root.after(500, self.update_model_status)
 
     def open_proctoring(self):
+        from proctoring import ProctoringApp
+
         self.clear_frame()
         ProctoringApp(self.root, self.logged_in_user)
 
+    def open_multi_camera(self):
+        from multi_camera import MultiCameraPage
+
+        self.clear_frame()
+        MultiCameraPage(self.root, self.logged_in_user)
+
     def open_recordings(self):
         self.clear_frame()
         RecordingsPage(self.root, self.logged_in_user)
@@ -0,0 +1,83 @@
+import threading
+
+
+STATUS_IDLE = "idle"
+STATUS_LOADING = "loading"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+_lock = threading.Lock()
+_thread = None
+_status = STATUS_IDLE
+_error = None
+_inference_engine = None
+_face_detector = None
+
+
+def _load():
+    """Load the configured inference backend and the face detector. Runs on a background thread."""
+    global _status, _error, _inference_engine, _face_detector
+    try:
+        from backends import create_backend
+        from config import load_config
+        from inference_engine import InferenceEngine
+        from face_detector import FaceDetector
+
+        backend = create_backend(load_config())
+
+        with _lock:
+            _inference_engine = InferenceEngine(backend)
+            _face_detector = FaceDetector()
+            _status = STATUS_READY
+    except Exception as error:
+        with _lock:
+            _error = error
+            _status = STATUS_FAILED
+        print(f"Model loading failed: {error}")
+
+
+def load_in_background():
+    """Start loading the model and detector if that has not happened yet."""
+    global _thread, _status, _error
+    with _lock:
+        if _status in (STATUS_LOADING, STATUS_READY):
+            return
+        _status = STATUS_LOADING
+        _error = None
+        _thread = threading.Thread(target=_load, name="model-loader", daemon=True)
+        _thread.start()
+
+
+def status():
+    with _lock:
+        return _status
+
+
+def error():
+    with _lock:
+        return _error
+
+
+def is_ready():
+    return status() == STATUS_READY
+
+
+def wait(timeout=None):
+    """Block until loading finishes; returns True when the model is ready."""
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+    return is_ready()
+
+
+def get_inference_engine():
+    if not is_ready():
+        raise RuntimeError("Model is not loaded yet")
+    return _inference_engine
+
+
+def get_face_detector():
+    if not is_ready():
+        raise RuntimeError("Face detector is not loaded yet")
+    return _face_detector
+
@@ -0,0 +1,188 @@
+import math
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+from PIL import Image, ImageTk
+
+import model_loader
+from config import load_config
+from session_manager import SessionManager, THUMBNAIL_SIZE
+from worker_client import RemoteSessionManager, WorkerClient
+
+proc_time = 30
+UI_POLL_INTERVAL_MS = 30
+MODEL_POLL_INTERVAL_MS = 200
+
+
+class MultiCameraPage:
+    """Monitor several cameras at once: one live thumbnail per configured source in a grid."""
+
+    def __init__(self, root, logged_in_user, sources=None):
+        self.root = root
+        self.logged_in_user = logged_in_user
+        config = load_config()
+        self.sources = sources if sources is not None else config["camera_sources"]
+        # With a worker configured this page is a thin client: the model and cameras live in the worker.
+        self.worker = WorkerClient(config["worker_url"]) if config["worker_url"] else None
+        self.manager = None
+        self.is_proctoring = False
+        self.bg_color = "#2E2F5B"
+
+        self.main_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.main_frame.pack(expand=True, fill="both")
+
+        self.grid_frame = tk.Frame(self.main_frame, bg=self.bg_color)
+        self.grid_frame.pack(expand=True)
+        columns = max(1, math.ceil(math.sqrt(len(self.sources))))
+        self.blank_thumbnail = ImageTk.PhotoImage(Image.new("RGB", THUMBNAIL_SIZE))
+        self.thumbnails = []
+        self.captions = []
+        for index, source in enumerate(self.sources):
+            row, column = divmod(index, columns)
+            cell = tk.Frame(self.grid_frame, bg=self.bg_color)
+            cell.grid(row=row, column=column, padx=5, pady=5)
+            thumbnail = tk.Label(cell, image=self.blank_thumbnail, bg="black")
+            thumbnail.pack()
+            caption = tk.Label(cell, text=f"cam{index}: {source}", bg=self.bg_color, fg="white", font=("Helvetica", 10))
+            caption.pack()
+            self.thumbnails.append(thumbnail)
+            self.captions.append(caption)
+
+        self.status_label = tk.Label(self.main_frame, text="Loading model...", bg=self.bg_color, fg="#F4D35E", font=("Helvetica", 12))
+        self.status_label.pack(pady=5)
+
+        button_frame = tk.Frame(self.main_frame, bg=self.bg_color)
+        button_frame.pack(pady=10)
+        self.start_button = tk.Button(button_frame, text="Start Proctoring", command=self.start_proctoring, bg="#F4A259", fg="white", font=("Helvetica", 14), state=tk.DISABLED)
+        self.start_button.pack(side="left", padx=5)
+        self.stop_button = tk.Button(button_frame, text="Stop Proctoring", command=self.stop_proctoring, bg="#F4A259", fg="white", font=("Helvetica", 14), state=tk.DISABLED)
+        self.stop_button.pack(side="left", padx=5)
+        self.back_button = tk.Button(button_frame, text="Back to Menu", command=self.go_back_to_menu, bg="#F4A259", fg="white", font=("Helvetica", 14))
+        self.back_button.pack(side="left", padx=5)
+
+        if self.worker is None:
+            model_loader.load_in_background()
+        self.check_model_ready()
+
+    def check_model_ready(self):
+        """Enable Start Proctoring once the background model load has finished."""
+        if not self.main_frame.winfo_exists():
+            return
+        if self.worker is not None:
+            self.run_in_background(lambda: self.worker.status()["model"], self.show_model_status,
+                                   self.worker_unreachable)
+        else:
+            self.show_model_status(model_loader.status())
+
+    def worker_unreachable(self, error):
+        if not self.main_frame.winfo_exists():
+            return
+        self.status_label.config(text=f"Proctoring worker unreachable: {error}")
+        self.root.after(MODEL_POLL_INTERVAL_MS * 5, self.check_model_ready)
+
+    def show_model_status(self, status):
+        if not self.main_frame.winfo_exists():
+            return
+        if status == model_loader.STATUS_READY:
+            self.status_label.config(text=f"Model ready, {len(self.sources)} cameras")
+            if not self.is_proctoring:
+                self.start_button.config(state=tk.NORMAL)
+        elif status == model_loader.STATUS_FAILED:
+            self.status_label.config(text=f"Model failed to load: {model_loader.error() if self.worker is None else 'see worker log'}")
+        else:
+            self.root.after(MODEL_POLL_INTERVAL_MS, self.check_model_ready)
+
+    def run_in_background(self, call, on_done, on_error):
+        """Run a blocking worker request off the Tk thread and hand its result (or error) back via `after`."""
+        def run():
+            try:
+                result = call()
+            except (OSError, RuntimeError) as error:
+                self.root.after(0, lambda: on_error(error))
+                return
+            self.root.after(0, lambda: on_done(result))
+
+        threading.Thread(target=run, name="worker-request", daemon=True).start()
+
+    def start_proctoring(self):
+        """Open every camera and start their pipelines on the shared inference engine."""
+        self.start_button.config(state=tk.DISABLED)
+        if self.worker is not None:
+            manager = RemoteSessionManager(self.worker, self.sources, self.logged_in_user, duration=proc_time)
+            self.run_in_background(manager.start, lambda result: self.session_started(manager),
+                                   self.session_failed)
+            return
+        manager = SessionManager(self.sources, model_loader.get_inference_engine(),
+                                 self.logged_in_user, duration=proc_time)
+        try:
+            manager.start()
+        except (OSError, RuntimeError) as error:
+            self.session_failed(error)
+            return
+        self.session_started(manager)
+
+    def session_started(self, manager):
+        self.manager = manager
+        self.is_proctoring = True
+        if not self.main_frame.winfo_exists():
+            # The page was left while the worker was starting the session; poll_sessions stops it.
+            self.root.after(UI_POLL_INTERVAL_MS, self.poll_sessions)
+            return
+        self.stop_button.config(state=tk.NORMAL)
+        self.root.after(UI_POLL_INTERVAL_MS, self.poll_sessions)
+
+    def session_failed(self, error):
+        if not self.main_frame.winfo_exists():
+            return
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        messagebox.showerror("Error", f"Could not start proctoring: {error}")
+
+    def poll_sessions(self):
+        """Refresh each thumbnail with its camera's newest analysed frame."""
+        if not self.main_frame.winfo_exists():
+            # The page was left mid-session: stop the cameras and finish without touching the UI.
+            # Managers send the stop once; repeated calls only wait for it to take effect.
+            self.manager.stop()
+            if self.manager.is_running():
+                self.root.after(UI_POLL_INTERVAL_MS, self.poll_sessions)
+            else:
+                self.manager.finish()
+            return
+        for session, thumbnail, caption in zip(self.manager.sessions, self.thumbnails, self.captions):
+            frame = session.latest_thumbnail()
+            if frame is not None:
+                img = ImageTk.PhotoImage(image=Image.fromarray(frame))
+                thumbnail.imgtk = img
+                thumbnail.config(image=img)
+            label = session.last_label or "No face"
+            caption.config(text=f"{session.name}: {label} ({session.analysis_fps():.1f} fps)",
+                           fg="#3AA17E" if label == "Allowed" else "#D9534F")
+        self.status_label.config(text=f"Analysing {self.manager.throughput():.1f} frames/s across {len(self.sources)} cameras")
+
+        if self.manager.is_running():
+            self.root.after(UI_POLL_INTERVAL_MS, self.poll_sessions)
+        else:
+            self.finish_session()
+
+    def finish_session(self):
+        summaries = self.manager.finish()
+        flagged = [summary["camera"] for summary in summaries if summary["result"] == "Not Allowed"]
+        self.status_label.config(text=f"Not Allowed on {', '.join(flagged)}" if flagged else "All cameras: Allowed")
+        self.is_proctoring = False
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+
+    def stop_proctoring(self):
+        print("Proctoring stopped.")
+        if self.manager is not None:
+            self.manager.stop()
+        if self.stop_button.winfo_exists():
+            self.stop_button.config(state=tk.DISABLED)
+
+    def go_back_to_menu(self):
+        if self.is_proctoring:
+            self.stop_proctoring()
+        from menu import MenuPage
+        MenuPage(self.root, self.logged_in_user)
@@ -0,0 +1,149 @@
+import logging
+import threading
+import queue
+import time
+
+
+CAPTURE_QUEUE_SIZE = 4
+RESULT_QUEUE_SIZE = 2
+# A failed read is retried after a delay that doubles up to the maximum; the capture stops
+# after this many failures in a row (about half a minute), e.g. when the camera was unplugged.
+CAPTURE_RETRY_SECONDS = 0.05
+CAPTURE_RETRY_MAX_SECONDS = 1.0
+MAX_CAPTURE_FAILURES = 30
+
+logger = logging.getLogger(__name__)
+
+
+class DropOldestQueue:
+    """Bounded queue that discards the oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def get(self, timeout=None):
+        """Return the next item, raising queue.Empty after the timeout."""
+        return self._queue.get(timeout=timeout)
+
+    def get_latest(self):
+        """Drain the queue and return only the newest item, or None if empty."""
+        latest = None
+        while True:
+            try:
+                latest = self._queue.get_nowait()
+            except queue.Empty:
+                return latest
+
+    def empty(self):
+        return self._queue.empty()
+
+
+class CapturePipeline:
+    """Capture -> analysis -> recorder stages joined by bounded drop-oldest queues.
+
+    The capture thread fans each timestamped frame out to the analysis
+    worker and the recorder's writer thread; the analysis worker publishes
+    its results for the UI, which polls them with `latest_result` from
+    `root.after`.
+    """
+
+    def __init__(self, cap, analyze, recorder=None, duration=None):
+        self.cap = cap
+        self.analyze = analyze
+        self.recorder = recorder
+        self.duration = duration
+        self.recording_stats = None
+
+        self.analysis_queue = DropOldestQueue(CAPTURE_QUEUE_SIZE)
+        self.result_queue = DropOldestQueue(RESULT_QUEUE_SIZE)
+
+        self._stop_event = threading.Event()
+        self._threads = []
+        self.frames_captured = 0
+        self.frames_analyzed = 0
+
+    def start(self):
+        self._stop_event.clear()
+        if self.recorder is not None:
+            self.recorder.start()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._analysis_loop, name="analysis", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Ask every stage to finish; returns immediately without joining."""
+        self._stop_event.set()
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def latest_result(self):
+        return self.result_queue.get_latest()
+
+    def _capture_loop(self):
+        start_time = time.time()
+        failures = 0
+        try:
+            while not self._stop_event.is_set() and self.cap.isOpened():
+                if self.duration is not None and time.time() - start_time >= self.duration:
+                    break
+                ret, frame = self.cap.read()
+                if not ret:
+                    failures += 1
+                    if failures == 1:
+                        logger.warning("Failed to capture an image; retrying")
+                    if failures >= MAX_CAPTURE_FAILURES:
+                        logger.error("Camera stopped delivering frames after %d attempts; ending capture", failures)
+                        break
+                    self._stop_event.wait(min(CAPTURE_RETRY_SECONDS * 2 ** (failures - 1), CAPTURE_RETRY_MAX_SECONDS))
+                    continue
+                if failures:
+                    logger.info("Capture recovered after %d failed reads", failures)
+                    failures = 0
+                timestamp = time.time()
+                self.frames_captured += 1
+                if self.recorder is not None:
+                    self.recorder.write(timestamp, frame)
+                self.analysis_queue.put((timestamp, frame))
+        finally:
+            self.cap.release()
+            self._stop_event.set()
+            if self.recorder is not None:
+                self.recording_stats = self.recorder.stop()
+
+    def _analysis_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                timestamp, frame = self.analysis_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                result = self.analyze(frame)
+            except Exception:
+                # One bad frame must not end the session; the next frame is analysed as usual.
+                logger.exception("Frame analysis failed; skipping frame")
+                continue
+            self.frames_analyzed += 1
+            self.result_queue.put((timestamp, result))
@@ -0,0 +1,302 @@
+import bisect
+import os
+import time
+import tkinter as tk
+from datetime import datetime
+from tkinter import messagebox
+
+import cv2
+from PIL import Image, ImageTk
+
+from alert_store import get_alert_store
+from recorder import RECORDING_FPS, frame_index_at, read_keyframe_index, read_timestamp_sidecar
+
+SPEEDS = (1, 2, 4, 8)
+INCIDENT_PREROLL_SECONDS = 2.0
+SCALE_RESOLUTION = 0.1
+
+
+class RecordingReader:
+    """Random-access reader for one recording, driven by its frame-index sidecar.
+
+    The sidecar maps every frame to the time it was captured, so seeking to
+    a wall-clock time or an incident is a bisect rather than a decode from
+    frame 0. Fast playback lands on the nearest keyframe at or before the
+    target and decodes forward from there, so jumping N frames never costs
+    more than one group of pictures; the frames passed over are only
+    grabbed, never converted to images.
+    """
+
+    def __init__(self, video_path, fps=None):
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open {video_path}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps or RECORDING_FPS
+        sidecar = read_timestamp_sidecar(video_path)
+        self.capture_times = [capture_time for _, _, capture_time, _ in sidecar] if sidecar else []
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)) or len(self.capture_times)
+        keyframes = read_keyframe_index(video_path) or []
+        # A lone frame 0 means the writer did not report its group-of-pictures size.
+        self.keyframes = keyframes if len(keyframes) > 1 else []
+        self.start_time = self.capture_times[0] if self.capture_times else None
+        self.position = -1
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps if self.fps else 0.0
+
+    def offset_of(self, index):
+        """Seconds from the start of the recording to frame `index`."""
+        if self.capture_times:
+            return self.capture_times[min(index, len(self.capture_times) - 1)] - self.start_time
+        return index / self.fps
+
+    def index_at_offset(self, seconds):
+        if self.capture_times:
+            return frame_index_at(self.start_time + seconds, self.capture_times, self.start_time, self.fps)
+        return max(0, min(int(seconds * self.fps), self.frame_count - 1))
+
+    def index_at_time(self, timestamp):
+        """Frame captured at or after a wall-clock `timestamp`, e.g. an incident start."""
+        if self.capture_times:
+            return frame_index_at(timestamp, self.capture_times, self.start_time, self.fps)
+        return None
+
+    def read_at(self, index):
+        """Decode frame `index`, seeking only when the next sequential read would not reach it cheaply."""
+        index = max(0, min(index, self.frame_count - 1)) if self.frame_count else max(0, index)
+        skip = index - self.position - 1
+        keyframe_position = bisect.bisect_right(self.keyframes, index) - 1
+        keyframe = self.keyframes[keyframe_position] if keyframe_position >= 0 else None
+        if keyframe is None:
+            seek = skip < 0 or skip > self.fps
+        else:
+            seek = skip < 0 or keyframe > self.position + 1
+        if seek:
+            # Without a keyframe index the backend finds the preceding keyframe itself.
+            start = keyframe if keyframe is not None else index
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            skip = index - start
+        for _ in range(skip):
+            if not self.cap.grab():
+                return None
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.position = index
+        return frame
+
+    def release(self):
+        self.cap.release()
+
+
+class PlaybackPage:
+    """Plays a recording inside the main window with seeking, incident jumps and 2x/4x/8x speed."""
+
+    def __init__(self, root, logged_in_user, recording, recordings_dir):
+        self.root = root
+        self.logged_in_user = logged_in_user
+        self.recording = recording
+        self.bg_color = "#2E2F5B"
+        self.label_color = "#F4D35E"
+        self.button_bg_color = "#505581"
+        self.button_fg_color = "#FFFFFF"
+        self.reader = RecordingReader(os.path.join(recordings_dir, recording["filename"]), fps=recording["fps"])
+        self.playing = False
+        self.speed = 1
+        self.play_job = None
+        # True while the position slider is held; playback waits and leaves the slider alone until release.
+        self.dragging = False
+        # Playback clock: frame `anchor_index` was on screen at `anchor_time`.
+        self.anchor_index = 0
+        self.anchor_time = 0.0
+
+        self.main_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.main_frame.pack(expand=True, fill="both")
+
+        tk.Label(self.main_frame, text=recording["filename"], font=("Helvetica", 16), bg=self.bg_color,
+                 fg=self.label_color).pack(pady=5)
+
+        content_frame = tk.Frame(self.main_frame, bg=self.bg_color)
+        content_frame.pack(expand=True, fill="both")
+        self.video_label = tk.Label(content_frame, bg="black")
+        self.video_label.pack(side="left", padx=10)
+
+        incident_frame = tk.Frame(content_frame, bg=self.bg_color)
+        incident_frame.pack(side="left", fill="y", padx=5)
+        tk.Label(incident_frame, text="Incidents", bg=self.bg_color, fg=self.button_fg_color).pack()
+        self.incident_list = tk.Listbox(incident_frame, width=28, exportselection=False)
+        self.incident_list.pack(expand=True, fill="y")
+        self.incident_list.bind("<<ListboxSelect>>", self.jump_to_incident)
+        self.incidents = self.load_incidents()
+
+        self.position_var = tk.DoubleVar(value=0.0)
+        self.position_scale = tk.Scale(self.main_frame, from_=0.0, to=max(self.reader.duration, SCALE_RESOLUTION),
+                                       resolution=SCALE_RESOLUTION, orient="horizontal", showvalue=False,
+                                       variable=self.position_var, bg=self.bg_color, fg=self.button_fg_color,
+                                       highlightthickness=0)
+        self.position_scale.pack(fill="x", padx=10)
+        self.position_scale.bind("<ButtonPress-1>", self.start_drag)
+        self.position_scale.bind("<ButtonRelease-1>", self.end_drag)
+        self.time_label = tk.Label(self.main_frame, text="", bg=self.bg_color, fg=self.button_fg_color)
+        self.time_label.pack()
+
+        control_frame = tk.Frame(self.main_frame, bg=self.bg_color)
+        control_frame.pack(pady=10)
+        self.play_button = tk.Button(control_frame, text="Play", command=self.toggle_play, bg="#3AA17E",
+                                     fg=self.button_fg_color, font=("Helvetica", 14), width=6)
+        self.play_button.pack(side="left", padx=5)
+        self.speed_buttons = {}
+        for speed in SPEEDS:
+            button = tk.Button(control_frame, text=f"{speed}x", command=lambda speed=speed: self.set_speed(speed),
+                               bg=self.button_bg_color, fg=self.button_fg_color, font=("Helvetica", 12))
+            button.pack(side="left", padx=2)
+            self.speed_buttons[speed] = button
+        tk.Label(control_frame, text="Go to (m:ss)", bg=self.bg_color, fg=self.button_fg_color).pack(side="left",
+                                                                                                   padx=5)
+        self.goto_entry = tk.Entry(control_frame, width=8)
+        self.goto_entry.pack(side="left")
+        self.goto_entry.bind("<Return>", lambda event: self.go_to_entered_time())
+        tk.Button(control_frame, text="Back", command=self.go_back, bg="#F4A259", fg=self.button_fg_color,
+                  font=("Helvetica", 14)).pack(side="left", padx=10)
+
+        self.set_speed(1)
+        self.show_frame(0)
+
+    def load_incidents(self):
+        """Fill the incident list from the alert store; returns the alerts in recording order."""
+        session_id = self.recording["session_id"] or os.path.splitext(self.recording["filename"])[0]
+        incidents = []
+        for alert in get_alert_store().query(session_id=session_id, newest_first=False):
+            index = self.reader.index_at_time(alert["timestamp"] - INCIDENT_PREROLL_SECONDS)
+            if index is None and self.recording["start_time"]:
+                index = self.reader.index_at_offset(
+                    alert["timestamp"] - INCIDENT_PREROLL_SECONDS - self.recording["start_time"])
+            if index is None:
+                continue
+            when = datetime.fromtimestamp(alert["timestamp"]).strftime("%H:%M:%S")
+            self.incident_list.insert(tk.END, f"{when}  {alert['label']}")
+            incidents.append((alert, index))
+        if not incidents:
+            self.incident_list.insert(tk.END, "No incidents.")
+        return incidents
+
+    def show_frame(self, index):
+        """Decode and display frame `index`; returns False once the recording has run out."""
+        frame = self.reader.read_at(index)
+        if frame is None:
+            return False
+        img = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+        self.video_label.imgtk = img
+        self.video_label.config(image=img)
+        offset = self.reader.offset_of(self.reader.position)
+        if not self.dragging:
+            self.position_var.set(offset)
+        self.time_label.config(text=f"{format_offset(offset)} / {format_offset(self.reader.duration)}  "
+                                    f"(frame {self.reader.position + 1} of {self.reader.frame_count}, "
+                                    f"{self.reader.fps:g} fps)")
+        return True
+
+    def toggle_play(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def play(self):
+        if self.reader.position >= self.reader.frame_count - 1:
+            self.show_frame(0)
+        self.playing = True
+        self.play_button.config(text="Pause")
+        self.reset_clock()
+        self.schedule_next_frame()
+
+    def pause(self):
+        self.playing = False
+        self.play_button.config(text="Play")
+        if self.play_job is not None:
+            self.root.after_cancel(self.play_job)
+            self.play_job = None
+
+    def set_speed(self, speed):
+        self.speed = speed
+        for button_speed, button in self.speed_buttons.items():
+            button.config(relief=tk.SUNKEN if button_speed == speed else tk.RAISED)
+        self.reset_clock()
+
+    def reset_clock(self):
+        self.anchor_index = max(self.reader.position, 0)
+        self.anchor_time = time.perf_counter()
+
+    def schedule_next_frame(self):
+        self.play_job = self.root.after(max(1, int(1000 / self.reader.fps)), self.advance)
+
+    def advance(self):
+        """Show the frame the playback clock has reached, skipping the ones in between at higher speeds."""
+        self.play_job = None
+        if not self.playing or not self.main_frame.winfo_exists():
+            return
+        if self.dragging:
+            self.schedule_next_frame()
+            return
+        elapsed = time.perf_counter() - self.anchor_time
+        target = self.anchor_index + int(elapsed * self.reader.fps * self.speed)
+        if target > self.reader.position and not self.show_frame(target):
+            self.pause()
+            return
+        if self.reader.position >= self.reader.frame_count - 1:
+            self.pause()
+            return
+        self.schedule_next_frame()
+
+    def start_drag(self, event=None):
+        self.dragging = True
+
+    def end_drag(self, event=None):
+        self.dragging = False
+        self.seek_offset(self.position_var.get())
+
+    def seek_offset(self, seconds):
+        self.show_frame(self.reader.index_at_offset(seconds))
+        self.reset_clock()
+
+    def jump_to_incident(self, event=None):
+        selection = self.incident_list.curselection()
+        if not selection or selection[0] >= len(self.incidents):
+            return
+        _, index = self.incidents[selection[0]]
+        self.show_frame(index)
+        self.reset_clock()
+
+    def go_to_entered_time(self):
+        try:
+            seconds = parse_offset(self.goto_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Enter a time such as 1:30 or 90.")
+            return
+        self.seek_offset(seconds)
+
+    def go_back(self):
+        """Stop playback and return to the recordings list."""
+        self.pause()
+        self.reader.release()
+        self.main_frame.destroy()
+        from recordings import RecordingsPage
+
+        RecordingsPage(self.root, self.logged_in_user)
+
+
+def format_offset(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def parse_offset(text):
+    """Seconds from "m:ss", "h:mm:ss" or a plain number of seconds."""
+    seconds = 0.0
+    for part in text.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    if seconds < 0:
+        raise ValueError(text)
+    return seconds
@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+
+from inference_engine import INPUT_SIZE
+from pipeline import RESULT_QUEUE_SIZE
+from recorder import FRAME_SIZE
+
+
+# RGB frames can sit in the result queue, be on screen and be in analysis at the same time.
+RGB_RING_SIZE = RESULT_QUEUE_SIZE + 2
+FACE_PADDING_H = 0.3
+FACE_PADDING_W = 0.15
+
+
+def pad_box(box, frame_shape, padding_h=FACE_PADDING_H, padding_w=FACE_PADDING_W):
+    """Expand a face box by the same margins the CNN was trained with, clipped to the frame."""
+    x_min, y_min, x_max, y_max = box
+    h, w = frame_shape[:2]
+    pad_h = int(padding_h * (y_max - y_min))
+    pad_w = int(padding_w * (x_max - x_min))
+    return max(0, x_min - pad_w), max(0, y_min - pad_h), min(w, x_max + pad_w), min(h, y_max + pad_h)
+
+
+class FramePreprocessor:
+    """Preallocated buffers that turn camera frames into model input without per-frame allocation.
+
+    `to_rgb` converts a BGR frame into the next buffer of a small ring, so
+    the same RGB array can be analysed, annotated and handed to the display.
+    `crop` resizes a face region straight into a slot of a preallocated
+    uint8 batch with `cv2.resize(dst=...)`; the backends cast to float
+    inside the model, so the batch never needs a float32 copy on the host.
+    """
+
+    def __init__(self, frame_size=FRAME_SIZE, batch_size=1, ring_size=RGB_RING_SIZE, crop_size=INPUT_SIZE):
+        width, height = frame_size
+        crop_height, crop_width = crop_size
+        self.crop_size = (crop_width, crop_height)
+        self._rgb_ring = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(ring_size)]
+        self._next_rgb = 0
+        self.batch = np.empty((batch_size, crop_height, crop_width, 3), dtype=np.uint8)
+
+    def to_rgb(self, frame):
+        """Convert a BGR frame into the next ring buffer and return that buffer."""
+        buffer = self._rgb_ring[self._next_rgb]
+        if buffer.shape != frame.shape:
+            buffer = np.empty_like(frame)
+            self._rgb_ring[self._next_rgb] = buffer
+        self._next_rgb = (self._next_rgb + 1) % len(self._rgb_ring)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+        return buffer
+
+    def crop(self, rgb_frame, box, slot=0):
+        """Resize `rgb_frame[box]` into batch slot `slot`; returns a (1, H, W, 3) view of that slot.
+
+        Returns None for an empty box, e.g. a face clipped to nothing at the frame edge.
+        """
+        x_min, y_min, x_max, y_max = box
+        if x_max <= x_min or y_max <= y_min:
+            return None
+        cv2.resize(rgb_frame[y_min:y_max, x_min:x_max], self.crop_size, dst=self.batch[slot])
+        return self.batch[slot:slot + 1]
@@ -1,15 +1,27 @@
-import tensorflow as tf
 import cv2
-from keras import models
 from PIL import Image, ImageTk
-import numpy as np
 import tkinter as tk
-import mediapipe as mp
 import time
 import os
-from datetime import datetime
+from pipeline import CapturePipeline
+import model_loader
+from face_tracker import FaceTracker
+from recorder import Recorder, recording_profile
+from evidence import KeyframeStore
+from clip_buffer import ClipBuffer
+from recordings_catalog import get_recordings_catalog
+from session_analysis import analyze_frame, new_session_id, start_incident_clip, store_incident
+from session_scoring import SessionScorer
+from thumbnail_indexer import get_thumbnail_indexer
+from preprocessing import FramePreprocessor
+from config import load_config
+from sequence_inference import SequenceInference
 
 proc_time = 30
+UI_POLL_INTERVAL_MS = 15
+MODEL_POLL_INTERVAL_MS = 200
+FACE_TRACKING = True
+REDETECT_INTERVAL = 10
 
 RECORDINGS_DIR = "recordings"
 ALERTS_DIR = "alerts"
@@ -21,26 +33,27 @@ if not os.path.exists(ALERTS_DIR):
     os.makedirs(ALERTS_DIR)
 
 
-model = tf.keras.models.load_model("Models\Final Model Used in Real Time Prediction\CNN_Model2.keras")  
-print("Model loaded:", model.summary())  
-
-
-mp_face_detection = mp.solutions.face_detection
-mp_drawing = mp.solutions.drawing_utils
-
 class ProctoringApp:
     def __init__(self, root, logged_in_user):
         self.root = root
         self.logged_in_user = logged_in_user
         self.cap = None
+        self.pipeline = None
+        self.face_detector = None
+        self.inference_engine = None
+        self.sequence_inference = None
+        self.face_tracker = None
         self.bg_color = "#2E2F5B"
         self.main_frame = tk.Frame(self.root, bg=self.bg_color)
         self.main_frame.pack(expand=True, fill="both")
         self.video_label = tk.Label(self.main_frame, bg=self.bg_color)
         self.video_label.pack(fill="both", expand=True)
 
+        self.model_status_label = tk.Label(self.main_frame, text="Loading model...", bg=self.bg_color, fg="#F4D35E", font=("Helvetica", 12))
+        self.model_status_label.pack(pady=5)
+
         
-        self.start_button = tk.Button(self.main_frame, text="Start Proctoring", command=self.capture_and_predict, bg="#F4A259", fg="white", font=("Helvetica", 14))
+        self.start_button = tk.Button(self.main_frame, text="Start Proctoring", command=self.capture_and_predict, bg="#F4A259", fg="white", font=("Helvetica", 14), state=tk.DISABLED)
         self.start_button.pack(pady=10)
         
         self.stop_button = tk.Button(self.main_frame, text="Stop Proctoring", command=self.stop_proctoring, bg="#F4A259", fg="white", font=("Helvetica", 14), state=tk.DISABLED)
@@ -52,142 +65,138 @@ class ProctoringApp:
 
         self.is_proctoring = False  
 
-    def capture_and_predict(self):
-        """Capture 2 images per second for 15 seconds, predict, and record video."""
-        self.cap = cv2.VideoCapture(0)
-        
-        
-        fourcc = cv2.VideoWriter_fourcc(*'XVID')
-        timestamp = int(time.time())
-        video_filename = f"proctoring_{timestamp}.avi"
-        video_path = os.path.join(RECORDINGS_DIR, video_filename)
-        out = cv2.VideoWriter(video_path, fourcc, 2.0, (640, 480))
-
-        predictions = []
-        allowed_images = []
-        not_allowed_image = None
-        captured_images = []
+        model_loader.load_in_background()
+        self.check_model_ready()
+
+    def check_model_ready(self):
+        """Enable Start Proctoring once the background model load has finished."""
+        if not self.main_frame.winfo_exists():
+            return
+        status = model_loader.status()
+        if status == model_loader.STATUS_READY:
+            self.inference_engine = model_loader.get_inference_engine()
+            self.face_detector = model_loader.get_face_detector()
+            self.model_status_label.config(text="Model ready")
+            if not self.is_proctoring:
+                self.start_button.config(state=tk.NORMAL)
+        elif status == model_loader.STATUS_FAILED:
+            self.model_status_label.config(text=f"Model failed to load: {model_loader.error()}")
+        else:
+            self.root.after(MODEL_POLL_INTERVAL_MS, self.check_model_ready)
 
-        start_time = time.time()  
+    def capture_and_predict(self):
+        """Start the capture, inference and recording pipeline for one session."""
+        profile = recording_profile()
+        self.session_id = new_session_id()
+        self.video_filename = f"{self.session_id}{profile['container']}"
+        self.video_path = os.path.join(RECORDINGS_DIR, self.video_filename)
+        self.clip_buffer = ClipBuffer(fps=profile["fps"])
+        recorder = Recorder.from_profile(self.video_path, profile, clip_buffer=self.clip_buffer)
+
+        self.preprocessor = FramePreprocessor()
+        self.evidence = KeyframeStore()
+        self.sequence_inference = None
+        if load_config().get("inference_mode") == "sequence":
+            self.sequence_inference = SequenceInference(self.inference_engine)
+        self.scorer = SessionScorer(on_incident_start=self.start_cheating_incident,
+                                    on_incident_end=self.store_cheating_alert)
+
+        self.start_time = time.time()
 
-       
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
-        self.is_proctoring = True 
+        self.is_proctoring = True
 
-        
-        while time.time() - start_time < proc_time and self.cap.isOpened() and self.is_proctoring:
-            ret, frame = self.cap.read()
-            if not ret:
-                print("Failed to capture an image")
-                continue
-
-          
-            out.write(frame)
-
-           
-            face, processed_face = self.detect_and_preprocess_face(frame)
-            if face is not None and processed_face is not None:
-            
-                x_min, y_min, x_max, y_max = face
-                cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-
-                
-                captured_images.append(frame)
-
-             
-                prediction = model.predict(processed_face)
-                class_index = np.argmax(prediction)
-                confidence = prediction[0][class_index] * 100
-                label = "Allowed" if class_index == 0 else "Not Allowed"
-                predictions.append(label)
-
-                
-                cv2.putText(frame, f"{label} ({confidence:.2f}%)", (x_min, y_min - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0) if label == "Allowed" else (0, 0, 255), 2)
-
-                if label == "Allowed":
-                    allowed_images.append(frame)
-                else:
-                    not_allowed_image = frame  
-                    self.store_cheating_alert()  
-            else:
-                print("No face detected.")
-
-          
-            img = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+        # Warm everything up before the camera opens so the first frame runs at steady-state latency.
+        self.inference_engine.start()
+        self.face_detector.warm_up()
+        self.cap = cv2.VideoCapture(0)
+        if FACE_TRACKING:
+            self.face_tracker = FaceTracker(self.face_detector.detect, redetect_interval=REDETECT_INTERVAL,
+                                            color_order="rgb")
+        self.pipeline = CapturePipeline(self.cap, self.analyze_frame, recorder=recorder, duration=proc_time)
+        self.pipeline.start()
+        self.root.after(UI_POLL_INTERVAL_MS, self.poll_pipeline)
+
+    def analyze_frame(self, frame):
+        """Detect, classify and annotate one frame. Runs on the analysis worker thread.
+
+        Returns the annotated RGB frame, which the UI displays as-is.
+        """
+        rgb_frame = self.preprocessor.to_rgb(frame)
+        now = time.time()
+        face, label, confidence = analyze_frame(rgb_frame, now, self.preprocessor, self.face_tracker,
+                                                self.face_detector, self.classify, self.scorer)
+        if face is None:
+            print("No face detected.")
+            confidence = 0.0
+        self.evidence.add(rgb_frame, label, confidence, now)
+        return rgb_frame
+
+    def classify(self, crop):
+        """(label, confidence %, window probabilities) for one crop, windowed in sequence mode."""
+        if self.sequence_inference is not None:
+            return self.sequence_inference.predict(crop)
+        return self.inference_engine.predict(crop)
+
+    def poll_pipeline(self):
+        """Show the newest analysed frame and reschedule until the pipeline has drained."""
+        result = self.pipeline.latest_result()
+        if result is not None and self.is_proctoring:
+            _, frame = result
+            img = ImageTk.PhotoImage(image=Image.fromarray(frame))
             self.video_label.imgtk = img
             self.video_label.config(image=img)
-            self.root.update()
 
-        self.cap.release()
-        out.release()  
-        cv2.destroyAllWindows()
+        if self.pipeline.is_running():
+            self.root.after(UI_POLL_INTERVAL_MS, self.poll_pipeline)
+        else:
+            self.finish_session()
 
-        end_time = time.time() 
+    def finish_session(self):
+        """Save metadata and show the aggregate result once every stage has stopped."""
+        end_time = time.time()
+        self.face_detector.stop()
+        self.scorer.close()
 
-       
-        self.save_recording_metadata(video_filename, start_time, end_time)
+        self.save_recording_metadata(self.video_filename, self.start_time, end_time)
 
-      
-        if not_allowed_image is not None:
+        if self.scorer.flagged:
             print("Aggregate Result: Not Allowed")
-            self.display_aggregated_result("Not Allowed", not_allowed_image)
+            self.display_aggregated_result("Not Allowed", self.evidence.best_violation())
         else:
             print("Aggregate Result: Allowed")
-            self.display_aggregated_result("Allowed", allowed_images[0] if allowed_images else None)
-
-        print(f"Recording saved at: {video_path}")
-        self.notify_recordings_page(video_filename)  
-
-    
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.is_proctoring = False  
+            self.display_aggregated_result("Allowed", self.evidence.first_allowed())
+        print("Predictions:", self.scorer.prediction_counts, "smoothed:", self.scorer.smoother.decision_counts)
+        print("Cheating incidents:", self.scorer.cheating_incidents.incidents)
+
+        print(f"Recording saved at: {self.video_path}")
+        print("Recording stats:", self.pipeline.recording_stats)
+        print("Inference latency:", self.inference_engine.latency_report())
+        print("Backend throughput:", self.inference_engine.backend.stats())
+        if self.sequence_inference is not None:
+            print("Window latency:", self.sequence_inference.latency_report())
+        if self.face_tracker is not None:
+            print(f"Face detector ran on {self.face_tracker.detections_run} frames, tracker on {self.face_tracker.frames_tracked}")
+        self.notify_recordings_page(self.video_filename)
+
+        self.is_proctoring = False
+        if self.main_frame.winfo_exists():
+            self.start_button.config(state=tk.NORMAL)
+            self.stop_button.config(state=tk.DISABLED)
 
     def stop_proctoring(self):
         """Stop the proctoring process immediately."""
         print("Proctoring stopped.")
-        self.is_proctoring = False  
-        self.cap.release()  
+        self.is_proctoring = False
+        if self.pipeline is not None:
+            self.pipeline.stop()
         self.stop_button.config(state=tk.DISABLED)
-        self.start_button.config(state=tk.NORMAL)
-
-    def detect_and_preprocess_face(self, frame):
-        """Detect face using Mediapipe, expand bounding box, and preprocess for CNN."""
-        with mp_face_detection.FaceDetection(min_detection_confidence=0.5) as face_detection:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) 
-            results = face_detection.process(rgb_frame)
-
-            if results.detections:
-                for detection in results.detections:
-                    bboxC = detection.location_data.relative_bounding_box
-                    h, w, _ = frame.shape
-                    x_min = int(bboxC.xmin * w)
-                    y_min = int(bboxC.ymin * h)
-                    x_max = int((bboxC.xmin + bboxC.width) * w)
-                    y_max = int((bboxC.ymin + bboxC.height) * h)
-
-                    
-                    padding_h = int(0.3 * (y_max - y_min))
-                    padding_w = int(0.15 * (x_max - x_min))
-                    x_min = max(0, x_min - padding_w)
-                    y_min = max(0, y_min - padding_h)
-                    x_max = min(w, x_max + padding_w)
-                    y_max = min(h, y_max + padding_h)
-
-                   
-                    face_rgb = rgb_frame[y_min:y_max, x_min:x_max]
-                    face_rgb = cv2.resize(face_rgb, (128, 128))
-                    face_rgb = np.expand_dims(face_rgb, axis=0)
-                    return (x_min, y_min, x_max, y_max), face_rgb
-
-        return None, None
 
     def display_aggregated_result(self, result, image_to_display):
         """Display the aggregated result."""        
-        if image_to_display is not None:
-            img = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(image_to_display, cv2.COLOR_BGR2RGB)))
+        if image_to_display is not None and self.video_label.winfo_exists():
+            img = ImageTk.PhotoImage(image=Image.fromarray(image_to_display))
             self.video_label.imgtk = img
             self.video_label.config(image=img)
 
@@ -195,36 +204,31 @@ class ProctoringApp:
 
     def go_back_to_menu(self):
         """Navigate back to the menu page."""
+        if self.is_proctoring:
+            self.stop_proctoring()
         from menu import MenuPage  
         MenuPage(self.root, self.logged_in_user)
 
-    def store_cheating_alert(self):
-        """Store an alert for 'Possible Cheating'."""        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        alert_message = f"Alert: Possible Cheating detected at {timestamp}"
-
-      
-        alert_filename = f"cheating_alert_{timestamp.replace(':', '_').replace(' ', '_')}.txt"
-        alert_path = os.path.join(ALERTS_DIR, alert_filename)
+    def start_cheating_incident(self, incident):
+        """Start an evidence clip as soon as a 'Possible Cheating' incident is confirmed."""
+        print(start_incident_clip(self.session_id, self.clip_buffer, incident, ALERTS_DIR))
 
-        with open(alert_path, 'w') as alert_file:
-            alert_file.write(alert_message)
-        
-        print(f"Alert saved: {alert_message}")
+    def store_cheating_alert(self, incident):
+        """Record one closed 'Possible Cheating' incident in the alert store."""
+        alert_message = store_incident(self.session_id, self.logged_in_user, incident)
+        print(f"Alert saved: {alert_message} ({incident.duration:.1f}s, {incident.frame_count} frames)")
 
     def save_recording_metadata(self, video_filename, start_time, end_time):
-        """Save metadata about the recording including start and end times."""        
-        metadata_filename = f"{video_filename}.txt"
-        metadata_path = os.path.join(RECORDINGS_DIR, metadata_filename)
-
-        start_datetime = datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S')
-        end_datetime = datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M:%S')
-
-        with open(metadata_path, 'w') as metadata_file:
-            metadata_file.write(f"Start Time: {start_datetime}\n")
-            metadata_file.write(f"End Time: {end_datetime}\n")
-
-        print(f"Recording metadata saved: {metadata_path}")
+        """Add the finished recording to the recordings catalog."""
+        recorder = self.pipeline.recorder
+        stats = self.pipeline.recording_stats or {}
+        get_recordings_catalog().add_recording(
+            self.video_path, session_id=self.session_id, username=self.logged_in_user,
+            start_time=start_time, end_time=end_time, frame_count=stats.get("frames_written"),
+            fps=recorder.fps, codec=recorder.fourcc, incident_count=self.scorer.cheating_incidents.incidents,
+        )
+        get_thumbnail_indexer().request(os.path.basename(self.video_path))
+        print(f"Recording catalogued: {video_filename}")
 
     def notify_recordings_page(self, filename):
         """Notify recordings.py about the newly saved video."""        
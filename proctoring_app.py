@@ -4,8 +4,15 @@ from PIL import Image, ImageTk
 import os
 import cv2
 import logging
+import time
 import numpy as np
 from datetime import datetime
+from face_tracker import FaceTracker
+from cascade_detector import CascadeFaceDetector
+from recorder import Recorder, recording_profile
+from incidents import IncidentEngine
+from alert_store import get_alert_store
+from recordings_catalog import RECORDING_EXTENSIONS, get_recordings_catalog
 
 
 users_db = {
@@ -85,12 +92,21 @@ class ProctoringApp:
         self.root.geometry("800x600")
         
         
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self.face_detector = CascadeFaceDetector()
 
         self.is_proctoring = False
         self.recording = False
         self.out = None  
-        self.last_face_detected_time = None  
+        self.session_id = None
+        self.face_tracker = FaceTracker(self.detect_faces)
+        self.no_face_incidents = IncidentEngine(
+            "No face detected", on_start=self.report_incident, on_end=self.store_incident,
+            min_duration=3.0, release_seconds=0.5,
+        )
+        self.head_angle_incidents = IncidentEngine(
+            "Suspicious head angle", on_start=self.report_incident, on_end=self.store_incident,
+            min_duration=0.5, release_seconds=1.0,
+        )
 
         self.show_proctoring()
 
@@ -129,12 +145,16 @@ class ProctoringApp:
         self.cap = cv2.VideoCapture(0)  
         
         
-        fourcc = cv2.VideoWriter_fourcc(*'XVID')  
-        filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + ".avi"
+        profile = recording_profile()
+        filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + profile["container"]
         filepath = os.path.join(RECORDINGS_DIR, filename)
-        self.out = cv2.VideoWriter(filepath, fourcc, 20.0, (640, 480))  
+        self.session_id = os.path.splitext(filename)[0]
+        self.out = Recorder.from_profile(filepath, profile)
+        self.out.start()
         
         self.recording = True  
+        self.face_detector.reset()
+        self.face_tracker.reset()
         self.show_frame()
         logging.info("Proctoring started.")
         self.alert_log_area.insert(tk.END, "Proctoring started.\nRecording started.\n")
@@ -145,7 +165,18 @@ class ProctoringApp:
             self.cap = None
 
         if self.out:
-            self.out.release()  
+            stats = self.out.stop()
+            logging.info(f"Recording stats: {stats}")
+            get_recordings_catalog().add_recording(
+                self.out.video_path, session_id=self.session_id, username=logged_in_user,
+                start_time=self.out.start_time, end_time=self.out.last_capture_time,
+                frame_count=stats["frames_written"], fps=self.out.fps, codec=self.out.fourcc,
+                incident_count=self.no_face_incidents.incidents + self.head_angle_incidents.incidents,
+            )
+            self.out = None
+
+        self.no_face_incidents.close()
+        self.head_angle_incidents.close()
         
         self.video_label.config(image='')  
         self.is_proctoring = False
@@ -157,20 +188,15 @@ class ProctoringApp:
         if self.cap and self.is_proctoring:
             ret, frame = self.cap.read()
             if ret:
-                gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = self.face_cascade.detectMultiScale(gray_frame, scaleFactor=1.1, minNeighbors=5)
+                now = time.time()
+                box = self.face_tracker.update(frame)
+                faces = [] if box is None else [(box[0], box[1], box[2] - box[0], box[3] - box[1])]
 
                 if len(faces) == 0:
-                    
-                    if self.last_face_detected_time is None:
-                        self.last_face_detected_time = datetime.now()
-                    else:
-                        elapsed_time = (datetime.now() - self.last_face_detected_time).total_seconds()
-                        if elapsed_time >= 3:  
-                            self.alert_log_area.insert(tk.END, "ALERT: No face detected for 3 seconds!\n")
-                            logging.warning("ALERT: No face detected for 3 seconds!")
+                    self.no_face_incidents.update(now, 1.0)
+                    self.head_angle_incidents.update(now, 0.0)
                 else:
-                    self.last_face_detected_time = None  
+                    self.no_face_incidents.update(now, 0.0)
                    
                     largest_face = max(faces, key=lambda rect: rect[2] * rect[3])  
                     x, y, w, h = largest_face
@@ -180,13 +206,13 @@ class ProctoringApp:
                    
                     if abs(head_angle) > 45:  
                         cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)  
-                        self.alert_log_area.insert(tk.END, "ALERT: Head angle indicates suspicious behavior!\n")
-                        logging.warning("ALERT: Head angle indicates suspicious behavior!")
+                        self.head_angle_incidents.update(now, 1.0, box)
                     else:
                         cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)  
+                        self.head_angle_incidents.update(now, 0.0)
 
                 if self.recording:
-                    self.out.write(frame)
+                    self.out.write(time.time(), frame)
 
                 cv2image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 img = Image.fromarray(cv2image)
@@ -196,6 +222,25 @@ class ProctoringApp:
 
             self.root.after(10, self.show_frame)
 
+    def report_incident(self, incident):
+        """Log an incident once, when it is confirmed, instead of on every frame."""
+        message = f"ALERT: {incident.kind} for {incident.duration:.1f} seconds!"
+        self.alert_log_area.insert(tk.END, message + "\n")
+        logging.warning(message)
+
+    def store_incident(self, incident):
+        """Record a closed incident as a single alert."""
+        message = f"{incident.kind} resolved after {incident.duration:.1f} seconds ({incident.frame_count} frames)."
+        if self.alert_log_area.winfo_exists():
+            self.alert_log_area.insert(tk.END, message + "\n")
+        logging.info(message)
+        # Both engines here are fed 0/1 flags, so their peak score is not a confidence.
+        get_alert_store().add_incident(self.session_id, logged_in_user, incident, scored=False)
+
+    def detect_faces(self, frame):
+        """Run the ROI/downscaled Haar cascade; boxes are (x_min, y_min, x_max, y_max) at full resolution, largest first."""
+        return self.face_detector.detect(frame)
+
     def get_head_angle(self, frame, face_coordinates):
        
         x, y, w, h = face_coordinates
@@ -240,7 +285,7 @@ class RecordingsPage:
         self.recordings_listbox = Listbox(self.root, height=15, width=50)
         self.recordings_listbox.pack(pady=10)
 
-        recordings = [f for f in os.listdir(RECORDINGS_DIR) if f.endswith(".avi")]
+        recordings = [f for f in os.listdir(RECORDINGS_DIR) if f.endswith(RECORDING_EXTENSIONS)]
         for recording in recordings:
             self.recordings_listbox.insert(tk.END, recording)
 
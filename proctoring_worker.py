@@ -0,0 +1,321 @@
+"""Headless proctoring worker exposing sessions, incidents and metrics over a local HTTP API.
+
+    python proctoring_worker.py
+    python proctoring_worker.py --port 8765
+
+The API has no authentication and can open any camera, stream URL or
+"fake:<file>" source it is given, so keep it on the loopback interface.
+
+Endpoints (JSON unless noted):
+
+    GET  /status                                    model load state and session ids
+    POST /sessions                                  {"sources": [...], "username": ..., "duration": ...}
+    GET  /sessions/<id>                             live per-camera status; summaries (or error) once finished
+    POST /sessions/<id>/stop                        stop every camera of a session
+    GET  /sessions/<id>/cameras/<name>/frame.jpg    newest annotated thumbnail (image/jpeg)
+    GET  /incidents?after=<seq>&timeout=<seconds>   long-poll for incident start/end events
+    GET  /metrics                                   inference latency, backend and per-session throughput
+
+For local testing without webcams, use "fake:<video file>" sources (see fake_camera.py).
+
+The multi-camera page becomes a client of this worker when "worker_url" is
+configured. The single-camera proctoring page (proctoring.py) and the legacy
+proctoring_app.py still run capture and inference in-process.
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+
+import model_loader
+from config import load_config
+from session_manager import SessionManager
+
+
+EVENT_HISTORY = 1000
+MAX_LONG_POLL_SECONDS = 30.0
+MONITOR_INTERVAL = 0.5
+# Finished sessions keep their summaries and last thumbnails this long for clients to collect, then are dropped.
+FINISHED_SESSION_TTL = 300.0
+JPEG_QUALITY = 70
+
+logger = logging.getLogger(__name__)
+
+
+class ProctoringWorker:
+    """Owns the model and every running SessionManager; the HTTP handler only translates requests.
+
+    Once a session finishes its manager (and the frames it holds) is
+    released; only the final status and last thumbnails are kept, for
+    FINISHED_SESSION_TTL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events_changed = threading.Condition(self._lock)
+        self._managers = {}
+        # session_id -> (finished_at, final status)
+        self._finished = {}
+        self._thumbnails = {}
+        self._events = deque(maxlen=EVENT_HISTORY)
+        self._next_seq = 1
+        self._monitor = threading.Thread(target=self._monitor_loop, name="session-monitor", daemon=True)
+        self._monitor.start()
+
+    def start_session(self, sources, username, duration=None):
+        if not model_loader.is_ready():
+            raise RuntimeError(f"Model is not ready ({model_loader.status()})")
+        manager = SessionManager(sources, model_loader.get_inference_engine(), username,
+                                 duration=duration, listener=self._on_incident)
+        manager.start()
+        session_id = f"session_{int(manager.start_time * 1000)}"
+        with self._lock:
+            self._managers[session_id] = manager
+        return session_id, [session.name for session in manager.sessions]
+
+    def stop_session(self, session_id):
+        with self._lock:
+            if session_id in self._finished:
+                return
+        self._manager(session_id).stop()
+
+    def session_status(self, session_id):
+        with self._lock:
+            if session_id in self._finished:
+                return self._finished[session_id][1]
+            manager = self._managers.get(session_id)
+        if manager is None:
+            raise KeyError(f"Unknown session {session_id}")
+        return self._status(session_id, manager)
+
+    def _status(self, session_id, manager, summaries=None, error=None):
+        return {
+            "session_id": session_id,
+            "running": summaries is None,
+            "throughput": manager.throughput(),
+            "cameras": [
+                {"name": session.name, "source": session.source, "label": session.last_label,
+                 "fps": session.analysis_fps(), "video_path": session.video_path}
+                for session in manager.sessions
+            ],
+            "summaries": summaries,
+            "error": error,
+        }
+
+    def thumbnail_jpeg(self, session_id, camera):
+        """JPEG of the newest thumbnail for one camera, or None before its first analysed frame."""
+        with self._lock:
+            if session_id in self._finished:
+                camera_names = [camera["name"] for camera in self._finished[session_id][1]["cameras"]]
+                if camera not in camera_names:
+                    raise KeyError(f"Unknown camera {camera}")
+                return self._thumbnails.get((session_id, camera))
+        manager = self._manager(session_id)
+        for session in manager.sessions:
+            if session.name == camera:
+                key = (session_id, camera)
+                frame = session.latest_thumbnail()
+                if frame is not None:
+                    ok, encoded = cv2.imencode(".jpg", cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
+                                               [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+                    if ok:
+                        with self._lock:
+                            self._thumbnails[key] = encoded.tobytes()
+                with self._lock:
+                    return self._thumbnails.get(key)
+        raise KeyError(f"Unknown camera {camera}")
+
+    def incidents(self, after=0, timeout=0.0):
+        """Events with seq > `after`, waiting up to `timeout` seconds for the first one."""
+        deadline = time.time() + min(timeout, MAX_LONG_POLL_SECONDS)
+        with self._events_changed:
+            while self._next_seq - 1 <= after:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._events_changed.wait(remaining)
+            events = [event for event in self._events if event["seq"] > after]
+            return {"events": events, "last_seq": self._next_seq - 1}
+
+    def metrics(self):
+        with self._lock:
+            managers = dict(self._managers)
+        metrics = {"model": model_loader.status(), "sessions": {
+            session_id: {"throughput": manager.throughput(), "cameras": len(manager.sessions)}
+            for session_id, manager in managers.items()
+        }}
+        if model_loader.is_ready():
+            engine = model_loader.get_inference_engine()
+            metrics["inference"] = engine.latency_report()
+            metrics["backend"] = engine.backend.stats()
+        return metrics
+
+    def status(self):
+        with self._lock:
+            session_ids = list(self._managers) + list(self._finished)
+        return {"model": model_loader.status(), "sessions": session_ids}
+
+    def _manager(self, session_id):
+        with self._lock:
+            if session_id not in self._managers:
+                raise KeyError(f"Unknown session {session_id}")
+            return self._managers[session_id]
+
+    def _on_incident(self, session, event, incident):
+        with self._events_changed:
+            self._events.append({
+                "seq": self._next_seq,
+                "event": event,
+                "session_id": session.session_id,
+                "camera": session.name,
+                "kind": incident.kind,
+                "start": incident.start,
+                "end": incident.end,
+                "peak_score": incident.peak_score,
+                "frame_count": incident.frame_count,
+                "evidence_path": incident.evidence_path,
+            })
+            self._next_seq += 1
+            self._events_changed.notify_all()
+
+    def _monitor_loop(self):
+        """Finish sessions whose cameras have all stopped, so incidents close and summaries appear."""
+        while True:
+            time.sleep(MONITOR_INTERVAL)
+            with self._lock:
+                finished = [(session_id, manager) for session_id, manager in self._managers.items()
+                            if manager.start_time is not None and not manager.is_running()]
+            for session_id, manager in finished:
+                try:
+                    status = self._status(session_id, manager, manager.finish())
+                except Exception as error:
+                    # Still retire the session, or the monitor would retry the failing finish forever.
+                    logger.exception("Finishing session %s failed", session_id)
+                    status = self._status(session_id, manager, [], error=str(error))
+                with self._lock:
+                    del self._managers[session_id]
+                    self._finished[session_id] = (time.time(), status)
+            self._evict_finished()
+
+    def _evict_finished(self):
+        expired_before = time.time() - FINISHED_SESSION_TTL
+        with self._lock:
+            expired = [session_id for session_id, (finished_at, _) in self._finished.items()
+                       if finished_at < expired_before]
+            for session_id in expired:
+                del self._finished[session_id]
+            for key in [key for key in self._thumbnails if key[0] in expired]:
+                del self._thumbnails[key]
+
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    worker = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        try:
+            if parts == ["status"]:
+                self._send_json(self.worker.status())
+            elif parts == ["metrics"]:
+                self._send_json(self.worker.metrics())
+            elif parts == ["incidents"]:
+                after = int(query.get("after", ["0"])[0])
+                timeout = float(query.get("timeout", ["0"])[0])
+                self._send_json(self.worker.incidents(after, timeout))
+            elif len(parts) == 2 and parts[0] == "sessions":
+                self._send_json(self.worker.session_status(parts[1]))
+            elif len(parts) == 5 and parts[0] == "sessions" and parts[2] == "cameras" and parts[4] == "frame.jpg":
+                jpeg = self.worker.thumbnail_jpeg(parts[1], parts[3])
+                if jpeg is None:
+                    self.send_response(204)
+                    self.end_headers()
+                else:
+                    self._send(200, "image/jpeg", jpeg)
+            else:
+                self._send_json({"error": "not found"}, 404)
+        except KeyError as error:
+            self._send_json({"error": str(error)}, 404)
+        except ValueError as error:
+            self._send_json({"error": str(error)}, 400)
+
+    def do_POST(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        try:
+            body = self._read_json()
+            if parts == ["sessions"]:
+                sources = body.get("sources") or load_config()["camera_sources"]
+                duration = body.get("duration")
+                if duration is not None and (isinstance(duration, bool) or not isinstance(duration, (int, float))
+                                             or duration <= 0):
+                    raise ValueError("duration must be a positive number of seconds")
+                session_id, cameras = self.worker.start_session(sources, body.get("username", "worker"), duration)
+                self._send_json({"session_id": session_id, "cameras": cameras}, 201)
+            elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "stop":
+                self.worker.stop_session(parts[1])
+                self._send_json({"session_id": parts[1], "stopping": True})
+            else:
+                self._send_json({"error": "not found"}, 404)
+        except KeyError as error:
+            self._send_json({"error": str(error)}, 404)
+        except ValueError as error:
+            self._send_json({"error": str(error)}, 400)
+        except RuntimeError as error:
+            self._send_json({"error": str(error)}, 503)
+
+    def log_message(self, format, *args):
+        # Thumbnail and long-poll requests arrive several times a second; keep the console for alerts.
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send_json(self, payload, status=200):
+        self._send(status, "application/json", json.dumps(payload, default=str).encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host, port):
+    model_loader.load_in_background()
+    WorkerRequestHandler.worker = ProctoringWorker()
+    server = ThreadingHTTPServer((host, port), WorkerRequestHandler)
+    server.daemon_threads = True
+    print(f"Proctoring worker listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=config["worker_host"])
+    parser.add_argument("--port", type=int, default=config["worker_port"])
+    args = parser.parse_args()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
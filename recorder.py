@@ -0,0 +1,226 @@
+import bisect
+import csv
+import os
+import queue
+import threading
+
+import cv2
+
+from config import load_config
+from pipeline import DropOldestQueue
+
+
+RECORDING_FPS = 10.0
+FRAME_SIZE = (640, 480)
+FOURCC = "XVID"
+RECORDER_QUEUE_SIZE = 64
+TIMESTAMP_SIDECAR_SUFFIX = ".frames.csv"
+# Codec, container, resolution, frame rate and quality per deployment, chosen by config "recording_profile".
+# "quality" (0-100) is passed to the writer where the codec honours it (MJPG); None keeps the codec default.
+# Compare them on the target machine with `python recording_benchmark.py`.
+RECORDING_PROFILES = {
+    "xvid": {"fourcc": "XVID", "container": ".avi", "frame_size": FRAME_SIZE, "fps": RECORDING_FPS, "quality": None},
+    "mjpeg_low_cpu": {"fourcc": "MJPG", "container": ".avi", "frame_size": FRAME_SIZE, "fps": RECORDING_FPS,
+                      "quality": 60},
+    "h264_compact": {"fourcc": "avc1", "container": ".mp4", "frame_size": FRAME_SIZE, "fps": RECORDING_FPS,
+                     "quality": None},
+    "mpeg4_mp4": {"fourcc": "mp4v", "container": ".mp4", "frame_size": FRAME_SIZE, "fps": RECORDING_FPS,
+                  "quality": None},
+    "xvid_small": {"fourcc": "XVID", "container": ".avi", "frame_size": (320, 240), "fps": 5.0, "quality": None},
+}
+DEFAULT_RECORDING_PROFILE = "xvid"
+# OpenCV's FFmpeg writer starts a new group of pictures every 12 frames; other backends do not say.
+FFMPEG_GOP_SIZE = 12
+
+
+def timestamp_sidecar_path(video_path):
+    return f"{video_path}{TIMESTAMP_SIDECAR_SUFFIX}"
+
+
+def read_timestamp_sidecar(video_path):
+    """Return [(frame_index, pts_seconds, capture_time, duplicate)] for a recording, or None if it has no sidecar."""
+    path = timestamp_sidecar_path(video_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", newline="") as sidecar:
+        return [
+            (int(row["frame_index"]), float(row["pts_seconds"]), float(row["capture_time"]), row["duplicate"] == "1")
+            for row in csv.DictReader(sidecar)
+        ]
+
+
+def recording_profile(setting=None):
+    """Resolve a "recording_profile" config value: a profile name, or a dict overriding fields of `"base"`."""
+    if setting is None:
+        setting = load_config()["recording_profile"]
+    if isinstance(setting, dict):
+        overrides = dict(setting)
+        name = overrides.pop("base", DEFAULT_RECORDING_PROFILE)
+    else:
+        name, overrides = setting, {}
+    if name not in RECORDING_PROFILES:
+        raise ValueError(f"Unknown recording profile {name!r}; choose from {', '.join(RECORDING_PROFILES)}")
+    profile = dict(RECORDING_PROFILES[name], **overrides)
+    profile["frame_size"] = tuple(profile["frame_size"])
+    profile["name"] = name
+    return profile
+
+
+def read_keyframe_index(video_path):
+    """Sorted frame indices flagged as keyframes in the sidecar, or None for recordings made before the flag."""
+    path = timestamp_sidecar_path(video_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", newline="") as sidecar:
+        reader = csv.DictReader(sidecar)
+        if "keyframe" not in (reader.fieldnames or []):
+            return None
+        return [int(row["frame_index"]) for row in reader if row["keyframe"] == "1"]
+
+
+def frame_index_at(timestamp, capture_times, start_time, fps):
+    """First frame captured at or after `timestamp`, from the sidecar capture times if there are any."""
+    if capture_times:
+        return min(bisect.bisect_left(capture_times, timestamp), len(capture_times) - 1)
+    return max(0, int((timestamp - start_time) * fps))
+
+
+class Recorder:
+    """Constant-frame-rate video writer fed from a bounded queue on its own thread.
+
+    Frames are placed on the output timeline by their capture timestamp:
+    when capture runs slower than `fps` the previous frame is repeated,
+    when it runs faster surplus frames are dropped, so playback at `fps`
+    matches wall-clock time. Every written frame gets a row in a CSV
+    sidecar (frame index, presentation time, capture time, duplicate flag,
+    keyframe flag) that the player uses to seek by time.
+    Kept frames are also handed to an optional ClipBuffer for evidence clips.
+    """
+
+    def __init__(self, video_path, fps=RECORDING_FPS, frame_size=FRAME_SIZE, fourcc=FOURCC, clip_buffer=None,
+                 quality=None):
+        self.video_path = video_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.fourcc = fourcc
+        self.quality = quality
+        self.clip_buffer = clip_buffer
+
+        self._queue = DropOldestQueue(RECORDER_QUEUE_SIZE)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._writer = None
+        self._sidecar = None
+        self._sidecar_writer = None
+        self._last_frame = None
+        self._last_timestamp = None
+        self.keyframe_interval = None
+
+        self.start_time = None
+        self.last_capture_time = None
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_duplicated = 0
+        self.frames_dropped = 0
+
+    @classmethod
+    def from_profile(cls, video_path, profile, clip_buffer=None):
+        """Recorder with a profile's codec settings; `video_path` should end in the profile's container."""
+        return cls(video_path, fps=profile["fps"], frame_size=profile["frame_size"],
+                   fourcc=profile["fourcc"], clip_buffer=clip_buffer, quality=profile["quality"])
+
+    def start(self):
+        self._writer = cv2.VideoWriter(
+            self.video_path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.frame_size
+        )
+        if not self._writer.isOpened() and self.fourcc != FOURCC:
+            # e.g. avc1 on an OpenCV build without an H.264 encoder; record something rather than nothing.
+            print(f"No {self.fourcc} encoder available, recording {self.video_path} with {FOURCC}")
+            self.fourcc = FOURCC
+            self._writer = cv2.VideoWriter(
+                self.video_path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.frame_size
+            )
+        if self.quality is not None:
+            self._writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.quality)
+        self.keyframe_interval = FFMPEG_GOP_SIZE if self._writer.getBackendName() == "FFMPEG" else None
+        self._sidecar = open(timestamp_sidecar_path(self.video_path), "w", newline="")
+        self._sidecar_writer = csv.writer(self._sidecar)
+        self._sidecar_writer.writerow(["frame_index", "pts_seconds", "capture_time", "duplicate", "keyframe"])
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+        self._thread.start()
+
+    def write(self, timestamp, frame):
+        """Queue a captured frame without blocking the caller."""
+        self._queue.put((timestamp, frame))
+
+    def stop(self):
+        """Flush queued frames, close the video and sidecar, and return recording stats."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stats()
+
+    def stats(self):
+        duration = 0.0
+        if self.start_time is not None and self.last_capture_time is not None:
+            duration = self.last_capture_time - self.start_time
+        return {
+            "frames_received": self.frames_received,
+            "frames_written": self.frames_written,
+            "frames_duplicated": self.frames_duplicated,
+            "frames_dropped": self.frames_dropped + self._queue.dropped,
+            "capture_fps": self.frames_received / duration if duration > 0 else 0.0,
+            "output_fps": self.fps,
+            "duration": duration,
+        }
+
+    def _write_loop(self):
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                try:
+                    timestamp, frame = self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                self._write_frame(timestamp, frame)
+        finally:
+            self._writer.release()
+            self._sidecar.close()
+            if self.clip_buffer is not None:
+                self.clip_buffer.flush()
+
+    def _write_frame(self, timestamp, frame):
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size)
+        if self.start_time is None:
+            self.start_time = timestamp
+        self.frames_received += 1
+        self.last_capture_time = timestamp
+
+        target_index = int(round((timestamp - self.start_time) * self.fps))
+        if target_index < self.frames_written:
+            self.frames_dropped += 1
+            return
+
+        if self.clip_buffer is not None:
+            self.clip_buffer.add(timestamp, frame)
+        while self._last_frame is not None and self.frames_written < target_index:
+            self._emit(self._last_frame, self._last_timestamp, duplicate=True)
+        self._emit(frame, timestamp, duplicate=False)
+        self._last_frame = frame
+        self._last_timestamp = timestamp
+
+    def _emit(self, frame, timestamp, duplicate):
+        self._writer.write(frame)
+        if self.keyframe_interval:
+            keyframe = self.frames_written % self.keyframe_interval == 0
+        else:
+            keyframe = self.frames_written == 0
+        self._sidecar_writer.writerow(
+            [self.frames_written, f"{self.frames_written / self.fps:.3f}", f"{timestamp:.3f}", int(duplicate),
+             int(keyframe)]
+        )
+        if duplicate:
+            self.frames_duplicated += 1
+        self.frames_written += 1
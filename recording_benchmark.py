@@ -0,0 +1,165 @@
+"""Compare recording profiles and OpenCV encoders on this machine: encode time, CPU and disk use.
+
+Encodes the same reference clip with every profile in recorder.RECORDING_PROFILES
+and, with --all-codecs, every candidate fourcc/container through every writer
+backend this OpenCV build offers, e.g.
+
+    python recording_benchmark.py
+    python recording_benchmark.py --clip recordings/proctoring_1700000000.avi --all-codecs --json encoders.json
+
+"CPU share" is process CPU time over wall time while encoding flat out (over
+100% means the encoder used several threads); "load at fps" is the share of
+one core the encoder would take while recording live at the profile's frame
+rate, i.e. what it takes away from inference.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from recorder import DEFAULT_RECORDING_PROFILE, RECORDING_PROFILES, recording_profile
+
+
+REFERENCE_SECONDS = 30
+SYNTHETIC_SEED = 0
+# (fourcc, container) pairs tried with --all-codecs; ones the build cannot open are reported as unavailable.
+CANDIDATE_CODECS = [
+    ("XVID", ".avi"), ("MJPG", ".avi"), ("mp4v", ".mp4"), ("avc1", ".mp4"), ("H264", ".mkv"),
+    ("VP80", ".webm"), ("VP90", ".webm"), ("FFV1", ".mkv"),
+]
+
+
+def synthetic_clip(frame_size, frame_count):
+    """A mostly static, textured scene with a moving face-sized blob and sensor noise, like a webcam at a desk."""
+    width, height = frame_size
+    rng = np.random.default_rng(SYNTHETIC_SEED)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 3)
+    frames = []
+    for index in range(frame_count):
+        frame = background.copy()
+        center = (int(width / 2 + width / 6 * np.sin(index / 15)), int(height / 2 + height / 12 * np.cos(index / 9)))
+        cv2.ellipse(frame, center, (width // 8, height // 5), 0, 0, 360, (90, 140, 200), -1)
+        noise = rng.integers(-6, 7, frame.shape, dtype=np.int16)
+        frames.append(np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def load_clip(path, frame_count):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    try:
+        while len(frames) < frame_count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    if not frames:
+        raise IOError(f"Cannot read frames from {path}")
+    return frames
+
+
+def writer_backends():
+    """[(api id, name)] of the video writer backends compiled into this OpenCV build."""
+    return [(api, cv2.videoio_registry.getBackendName(api)) for api in cv2.videoio_registry.getWriterBackends()]
+
+
+def encode(frames, output_path, fourcc, fps, frame_size, quality=None, api=cv2.CAP_ANY):
+    """Write `frames` once and return timing and size figures, or None if the encoder cannot be opened."""
+    frames = [frame if (frame.shape[1], frame.shape[0]) == frame_size else cv2.resize(frame, frame_size)
+              for frame in frames]
+    writer = cv2.VideoWriter(output_path, api, cv2.VideoWriter_fourcc(*fourcc), fps, frame_size)
+    if not writer.isOpened():
+        return None
+    if quality is not None:
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, quality)
+    backend = writer.getBackendName()
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    size_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    seconds_of_video = len(frames) / fps
+    return {
+        "backend": backend,
+        "frames": len(frames),
+        "encode_ms_per_frame": wall / len(frames) * 1000,
+        "cpu_ms_per_frame": cpu / len(frames) * 1000,
+        "cpu_share": cpu / wall if wall > 0 else 0.0,
+        "load_at_fps": cpu / seconds_of_video,
+        "bytes_per_minute": size_bytes / seconds_of_video * 60,
+    }
+
+
+def run(frames, all_codecs):
+    """Benchmark every recording profile, then optionally every candidate codec on every writer backend."""
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="recording_benchmark_")
+    try:
+        for name in RECORDING_PROFILES:
+            profile = recording_profile(name)
+            output_path = os.path.join(work_dir, f"{name}{profile['container']}")
+            result = encode(frames, output_path, profile["fourcc"], profile["fps"], profile["frame_size"],
+                            profile["quality"])
+            results.append(dict(result or {}, name=f"profile {name}", fourcc=profile["fourcc"],
+                                container=profile["container"], frame_size=profile["frame_size"],
+                                fps=profile["fps"], available=result is not None))
+
+        if all_codecs:
+            base = recording_profile(DEFAULT_RECORDING_PROFILE)
+            for api, api_name in writer_backends():
+                for fourcc, container in CANDIDATE_CODECS:
+                    output_path = os.path.join(work_dir, f"{api_name}_{fourcc}{container}")
+                    result = encode(frames, output_path, fourcc, base["fps"], base["frame_size"], api=api)
+                    results.append(dict(result or {}, name=f"{api_name} {fourcc}", fourcc=fourcc,
+                                        container=container, frame_size=base["frame_size"], fps=base["fps"],
+                                        available=result is not None))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clip", default=None, help="reference video (default: a synthetic webcam-like clip)")
+    parser.add_argument("--seconds", type=float, default=REFERENCE_SECONDS,
+                        help="length of the reference clip at the default profile's frame rate")
+    parser.add_argument("--all-codecs", action="store_true", help="also try every candidate fourcc on every backend")
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    base = recording_profile(DEFAULT_RECORDING_PROFILE)
+    frame_count = max(1, int(args.seconds * base["fps"]))
+    frames = load_clip(args.clip, frame_count) if args.clip else synthetic_clip(base["frame_size"], frame_count)
+    print(f"Reference clip: {len(frames)} frames, {args.clip or 'synthetic'}; OpenCV {cv2.__version__}")
+
+    results = run(frames, args.all_codecs)
+    print(f"{'encoder':<28} {'size':>9} {'fps':>5} {'ms/frame':>9} {'CPU share':>10} {'load at fps':>12} "
+          f"{'MB/minute':>10}")
+    for result in results:
+        size = "x".join(str(side) for side in result["frame_size"])
+        if not result["available"]:
+            print(f"{result['name']:<28} {size:>9} {result['fps']:>5g}  unavailable ({result['fourcc']}"
+                  f"{result['container']})")
+            continue
+        print(f"{result['name']:<28} {size:>9} {result['fps']:>5g} {result['encode_ms_per_frame']:>9.2f} "
+              f"{result['cpu_share']:>9.0%} {result['load_at_fps']:>11.1%} {result['bytes_per_minute'] / 1e6:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as report_file:
+            json.dump(results, report_file, indent=2, default=list)
+
+
+if __name__ == "__main__":
+    main()
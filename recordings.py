@@ -1,9 +1,20 @@
+import sqlite3
+import threading
 import tkinter as tk
-from tkinter import Label, Button, Listbox, Scrollbar, messagebox
-import cv2
+from tkinter import Label, Button, Entry, Frame, messagebox
 import os
+from PIL import Image, ImageTk
+from playback import PlaybackPage
+from recorder import timestamp_sidecar_path
+from recordings_catalog import day_range, format_recording, get_recordings_catalog
+from thumbnail_indexer import get_thumbnail_indexer
+from virtual_list import VirtualList
 
 RECORDINGS_DIR = "recordings"
+THUMBNAIL_RETRY_MS = 500
+THUMBNAIL_RETRIES = 10
+
+_catalog_reconciled = False
 
 if not os.path.exists(RECORDINGS_DIR):
     os.makedirs(RECORDINGS_DIR)
@@ -18,6 +29,11 @@ class RecordingsPage:
         self.label_color = "#F4D35E" 
         self.button_bg_color = "#505581"  
         self.button_fg_color = "#FFFFFF"  
+        self.catalog = get_recordings_catalog()
+        self.indexer = get_thumbnail_indexer()
+        self.indexer.start()
+        self.thumbnail_images = []
+        self.thumbnail_job = None
 
         self.show_recordings()
 
@@ -34,19 +50,35 @@ class RecordingsPage:
             bg=self.bg_color,
             fg=self.label_color,
         )
-        title_label.grid(row=0, column=0, columnspan=3, pady=10)
+        title_label.grid(row=0, column=0, columnspan=4, pady=10)
+
+        filter_frame = Frame(self.root, bg=self.bg_color)
+        filter_frame.grid(row=1, column=0, columnspan=4, pady=5)
+        Label(filter_frame, text="User", bg=self.bg_color, fg=self.button_fg_color).pack(side="left", padx=5)
+        self.user_entry = Entry(filter_frame, width=15)
+        self.user_entry.pack(side="left")
+        Label(filter_frame, text="Date (YYYY-MM-DD)", bg=self.bg_color, fg=self.button_fg_color).pack(side="left", padx=5)
+        self.date_entry = Entry(filter_frame, width=12)
+        self.date_entry.pack(side="left")
+        Button(filter_frame, text="Filter", command=self.apply_filters, bg=self.button_bg_color,
+               fg=self.button_fg_color).pack(side="left", padx=5)
 
         
-        self.recordings_listbox = Listbox(
-            self.root, height=15, width=50, bg="#FFFFFF", fg="#000000"
+        self.recordings_list = VirtualList(
+            self.root,
+            count=lambda search: self.catalog.count(*self.current_filters(), search=search),
+            fetch=lambda offset, limit, search: self.catalog.query(
+                *self.current_filters(), limit=limit, offset=offset, search=search),
+            format_row=format_recording,
+            on_select=self.show_thumbnails,
+            empty_text="No recordings found.",
+            bg=self.bg_color,
+            height=15, width=50, background="#FFFFFF", foreground="#000000",
         )
-        self.recordings_listbox.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.recordings_list.grid(row=2, column=0, columnspan=4, padx=10, pady=10, sticky="nsew")
 
-        
-        scrollbar = Scrollbar(self.root)
-        scrollbar.grid(row=1, column=1, sticky="ns")
-        self.recordings_listbox.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.recordings_listbox.yview)
+        self.thumbnail_frame = Frame(self.root, bg=self.bg_color, height=130)
+        self.thumbnail_frame.grid(row=3, column=0, columnspan=4, padx=10, sticky="ew")
 
         self.populate_recordings()
 
@@ -59,7 +91,7 @@ class RecordingsPage:
             fg=self.button_fg_color,
             font=("Helvetica", 14),
         )
-        play_button.grid(row=2, column=0, padx=10, pady=10)
+        play_button.grid(row=4, column=0, padx=10, pady=10)
 
         
         delete_button = Button(
@@ -70,7 +102,17 @@ class RecordingsPage:
             fg=self.button_fg_color,
             font=("Helvetica", 14),
         )
-        delete_button.grid(row=2, column=1, padx=10, pady=10)
+        delete_button.grid(row=4, column=1, padx=10, pady=10)
+
+        self.reconcile_button = Button(
+            self.root,
+            text="Reconcile",
+            command=self.reconcile_catalog,
+            bg=self.button_bg_color,
+            fg=self.button_fg_color,
+            font=("Helvetica", 14),
+        )
+        self.reconcile_button.grid(row=4, column=2, padx=10, pady=10)
 
       
         return_button = Button(
@@ -81,70 +123,141 @@ class RecordingsPage:
             fg=self.button_fg_color,
             font=("Helvetica", 14),
         )
-        return_button.grid(row=2, column=2, padx=10, pady=10)
+        return_button.grid(row=4, column=3, padx=10, pady=10)
 
         
-        self.root.grid_rowconfigure(1, weight=1)
+        self.root.grid_rowconfigure(2, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
 
-    def populate_recordings(self):
-        """Populate the listbox with available recording files."""
-        self.recordings_listbox.delete(0, tk.END)
-        recordings = [f for f in os.listdir(RECORDINGS_DIR) if f.endswith(".avi")]
-        for recording in recordings:
-            metadata_filename = f"{recording}.txt"
-            metadata_path = os.path.join(RECORDINGS_DIR, metadata_filename)
-            start_time = "Unknown"
-            end_time = "Unknown"
-            
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as metadata_file:
-                    lines = metadata_file.readlines()
-                    start_time = lines[0].strip().split(": ")[1]
-                    end_time = lines[1].strip().split(": ")[1]
-
-           
-            self.recordings_listbox.insert(
-                tk.END, f"{recording} (Start: {start_time}, End: {end_time})"
-            )
+        if not _catalog_reconciled:
+            # First visit in this process (e.g. right after upgrading, when recordings.db is still empty):
+            # index what is already on disk without waiting for the user to press Reconcile.
+            self.reconcile_catalog(quiet=True)
 
-    def play_selected_recording(self):
-        """Play the selected recording using OpenCV."""
+    def current_filters(self):
+        """(username, since, until) from the filter fields; an unparseable date is ignored."""
+        username = self.user_entry.get().strip() or None
+        since = until = None
         try:
-            selected_recording = self.recordings_listbox.get(
-                self.recordings_listbox.curselection()
-            )
-            recording_path = os.path.join(RECORDINGS_DIR, selected_recording.split(' ')[0]) 
-            self.play_video(recording_path)
-        except tk.TclError:
-            messagebox.showerror("Error", "Please select a recording to play.")
+            since, until = day_range(self.date_entry.get().strip())
+        except ValueError:
+            pass
+        return username, since, until
+
+    def apply_filters(self):
+        date_text = self.date_entry.get().strip()
+        if date_text:
+            try:
+                day_range(date_text)
+            except ValueError:
+                messagebox.showerror("Error", "Dates must look like 2024-05-01.")
+                return
+        self.recordings_list.refresh(keep_position=False)
 
-    def play_video(self, video_path):
-        """Play the video at normal speed using OpenCV."""
-        cap = cv2.VideoCapture(video_path)
-        fps = 10  
-        delay = int(1000 / fps)  
+    def populate_recordings(self):
+        """Reload the visible window of recordings from the catalog."""
+        self.recordings_list.refresh()
+
+    def selected_recording(self):
+        """Catalog row for the selected entry; raises TclError when nothing is selected."""
+        recording = self.recordings_list.selected_row()
+        if recording is None:
+            raise tk.TclError("no selection")
+        return recording
+
+    def show_thumbnails(self, recording, attempts=0):
+        """Show the poster and incident keyframes of the selected recording below the list.
+
+        Recordings the indexer has not reached yet are moved to the front of
+        its queue and the strip is retried until their thumbnails appear.
+        """
+        if self.thumbnail_job is not None:
+            self.root.after_cancel(self.thumbnail_job)
+            self.thumbnail_job = None
+        if not self.thumbnail_frame.winfo_exists():
+            return
+        for widget in self.thumbnail_frame.winfo_children():
+            widget.destroy()
+        self.thumbnail_images = []
+        if recording is None:
+            return
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            cv2.imshow("Playing Recording", frame)
+        thumbnails = self.indexer.thumbnails(recording["filename"])
+        if not thumbnails:
+            if attempts == 0:
+                self.indexer.request(recording["filename"])
+            if attempts < THUMBNAIL_RETRIES:
+                self.thumbnail_job = self.root.after(
+                    THUMBNAIL_RETRY_MS, lambda: self.show_thumbnails(recording, attempts + 1))
+            return
 
-            
-            if cv2.waitKey(delay) & 0xFF == ord("q"):
-                break
+        start_time = recording["start_time"]
+        for kind, timestamp, path in thumbnails:
+            try:
+                image = ImageTk.PhotoImage(Image.open(path))
+            except OSError:
+                continue
+            self.thumbnail_images.append(image)
+            if kind == "poster" or start_time is None:
+                caption = kind.capitalize()
+            else:
+                caption = f"Incident at {max(0, timestamp - start_time):.0f}s"
+            Label(self.thumbnail_frame, image=image, text=caption, compound="top", bg=self.bg_color,
+                  fg=self.button_fg_color).pack(side="left", padx=5)
 
-        cap.release()
-        cv2.destroyAllWindows()
+    def reconcile_catalog(self, quiet=False):
+        """Catch the catalog up with files added or deleted outside the app, off the UI thread."""
+        self.reconcile_button.config(state=tk.DISABLED, text="Reconciling...")
+
+        def run():
+            global _catalog_reconciled
+            try:
+                added, removed = self.catalog.reconcile()
+            except (OSError, sqlite3.Error) as error:
+                self.root.after(0, lambda: self.reconcile_failed(error))
+                return
+            _catalog_reconciled = True
+            self.root.after(0, lambda: self.reconcile_finished(added, removed, quiet))
+
+        threading.Thread(target=run, name="recordings-reconcile", daemon=True).start()
+
+    def reconcile_finished(self, added, removed, quiet=False):
+        if added:
+            self.indexer.start()
+        if not self.recordings_list.winfo_exists():
+            return
+        self.reconcile_button.config(state=tk.NORMAL, text="Reconcile")
+        self.populate_recordings()
+        if not quiet:
+            messagebox.showinfo("Reconciled", f"{added} recordings added, {removed} removed.")
+
+    def reconcile_failed(self, error):
+        if not self.recordings_list.winfo_exists():
+            return
+        self.reconcile_button.config(state=tk.NORMAL, text="Reconcile")
+        messagebox.showerror("Error", f"Could not reconcile recordings: {error}")
+
+    def play_selected_recording(self):
+        """Open the selected recording in the in-window player."""
+        try:
+            recording = self.selected_recording()
+        except tk.TclError:
+            messagebox.showerror("Error", "Please select a recording to play.")
+            return
+        try:
+            if self.thumbnail_job is not None:
+                self.root.after_cancel(self.thumbnail_job)
+            self.clear_frame()
+            PlaybackPage(self.root, self.logged_in_user, recording, RECORDINGS_DIR)
+        except IOError as error:
+            messagebox.showerror("Error", str(error))
+            self.show_recordings()
 
     def delete_selected_recording(self):
         """Delete the selected recording after user confirmation."""
         try:
-            selected_recording = self.recordings_listbox.get(
-                self.recordings_listbox.curselection()
-            )
-            recording_path = os.path.join(RECORDINGS_DIR, selected_recording.split(' ')[0])  
+            selected_recording = self.selected_recording()["filename"]
+            recording_path = os.path.join(RECORDINGS_DIR, selected_recording)
 
           
             confirm = messagebox.askyesno(
@@ -152,19 +265,25 @@ class RecordingsPage:
                 f"Are you sure you want to delete '{selected_recording}'?",
             )
             if confirm:
-                os.remove(recording_path)
-                metadata_filename = f"{recording_path}.txt"
-                if os.path.exists(metadata_filename):
-                    os.remove(metadata_filename)  
+                if os.path.exists(recording_path):
+                    os.remove(recording_path)
+                self.catalog.remove(selected_recording)
+                self.indexer.cache.forget(selected_recording)
+                for sidecar_path in (f"{recording_path}.txt", timestamp_sidecar_path(recording_path)):
+                    if os.path.exists(sidecar_path):
+                        os.remove(sidecar_path)
                 messagebox.showinfo(
                     "Deleted", f"'{selected_recording}' has been deleted."
                 )
                 self.populate_recordings()
+                self.show_thumbnails(None)
         except tk.TclError:
             messagebox.showerror("Error", "Please select a recording to delete.")
 
     def return_to_menu(self):
         """Return to the main menu."""
+        if self.thumbnail_job is not None:
+            self.root.after_cancel(self.thumbnail_job)
         self.clear_frame()
         from menu import MenuPage  
 
@@ -0,0 +1,247 @@
+"""SQLite catalog of session recordings, so the recordings page never scans the directory.
+
+    python recordings_catalog.py reconcile      # index files added or removed outside the app
+    python recordings_catalog.py list --user alice --date 2024-05-01
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import cv2
+
+from alert_store import connect_db
+
+
+RECORDINGS_DB = "recordings.db"
+RECORDINGS_DIR = "recordings"
+RECORDING_EXTENSIONS = (".avi", ".mp4", ".mkv")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS recordings (
+        filename TEXT PRIMARY KEY,
+        session_id TEXT,
+        username TEXT,
+        start_time REAL,
+        end_time REAL,
+        duration REAL,
+        frame_count INTEGER,
+        fps REAL,
+        size_bytes INTEGER,
+        codec TEXT,
+        incident_count INTEGER,
+        indexed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_recordings_start ON recordings (start_time);
+    CREATE INDEX IF NOT EXISTS idx_recordings_user ON recordings (username, start_time);
+"""
+
+COLUMNS = ("filename", "session_id", "username", "start_time", "end_time", "duration", "frame_count", "fps",
+           "size_bytes", "codec", "incident_count", "indexed_at")
+
+
+def _fourcc_text(value):
+    code = int(value)
+    text = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return text if text.strip("\x00").isprintable() and code else None
+
+
+def _legacy_metadata_times(video_path):
+    """Start/end from the free-text `<name>.avi.txt` written by older versions, if present."""
+    metadata_path = f"{video_path}.txt"
+    if not os.path.exists(metadata_path):
+        return None, None
+    times = []
+    with open(metadata_path, "r") as metadata_file:
+        for line in metadata_file.readlines()[:2]:
+            try:
+                times.append(datetime.strptime(line.strip().split(": ", 1)[1], "%Y-%m-%d %H:%M:%S").timestamp())
+            except (IndexError, ValueError):
+                times.append(None)
+    times += [None] * (2 - len(times))
+    return times[0], times[1]
+
+
+def probe_recording(video_path):
+    """Catalog fields read from the file itself, for recordings that were not catalogued at session end."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+        fps = cap.get(cv2.CAP_PROP_FPS) or None
+        codec = _fourcc_text(cap.get(cv2.CAP_PROP_FOURCC))
+    finally:
+        cap.release()
+    duration = frame_count / fps if frame_count and fps else None
+    start_time, end_time = _legacy_metadata_times(video_path)
+    if end_time is None:
+        end_time = os.path.getmtime(video_path)
+    if start_time is None and duration is not None:
+        start_time = end_time - duration
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": duration if duration is not None else (end_time - start_time if start_time else None),
+        "frame_count": frame_count,
+        "fps": fps,
+        "codec": codec,
+    }
+
+
+class RecordingsCatalog:
+    """One row per recording: who, when, how long, how big, which codec and how many incidents.
+
+    Sessions add their row when they finish; `reconcile` catches up with
+    files copied into or deleted from the recordings folder by hand.
+    """
+
+    def __init__(self, db_path=RECORDINGS_DB, recordings_dir=RECORDINGS_DIR):
+        self.db_path = db_path
+        self.recordings_dir = recordings_dir
+        self._lock = threading.Lock()
+        self._conn = connect_db(db_path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def add_recording(self, video_path, session_id=None, username=None, start_time=None, end_time=None,
+                      frame_count=None, fps=None, codec=None, incident_count=None):
+        """Insert or replace the row for one recording file."""
+        filename = os.path.basename(video_path)
+        size_bytes = os.path.getsize(video_path) if os.path.exists(video_path) else None
+        duration = end_time - start_time if start_time is not None and end_time is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO recordings ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                (filename, session_id, username, start_time, end_time, duration, frame_count, fps, size_bytes,
+                 codec, incident_count, time.time()),
+            )
+
+    def remove(self, filename):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM recordings WHERE filename = ?", (filename,))
+
+    def get(self, filename):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM recordings WHERE filename = ?", (filename,)).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def _where(self, username=None, since=None, until=None, search=None):
+        clauses, params = [], []
+        if username:
+            clauses.append("username = ?")
+            params.append(username)
+        if since is not None:
+            clauses.append("start_time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("start_time < ?")
+            params.append(until)
+        if search:
+            clauses.append("(filename LIKE ? OR username LIKE ?)")
+            params += [f"%{search}%"] * 2
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, username=None, since=None, until=None, limit=None, offset=0, search=None):
+        """Return recordings as dicts, newest first, filtered by user, start-time range and a substring `search`."""
+        where, params = self._where(username, since, until, search)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM recordings{where} ORDER BY start_time DESC, filename"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, username=None, since=None, until=None, search=None):
+        where, params = self._where(username, since, until, search)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM recordings{where}", params).fetchone()[0]
+
+    def reconcile(self):
+        """Index recordings missing from the catalog and drop rows whose file is gone; returns (added, removed)."""
+        on_disk = {
+            filename for filename in os.listdir(self.recordings_dir)
+            if filename.endswith(RECORDING_EXTENSIONS)
+        } if os.path.isdir(self.recordings_dir) else set()
+        with self._lock:
+            catalogued = {row[0] for row in self._conn.execute("SELECT filename FROM recordings")}
+
+        removed = catalogued - on_disk
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM recordings WHERE filename = ?", [(name,) for name in removed])
+
+        added = sorted(on_disk - catalogued)
+        for filename in added:
+            video_path = os.path.join(self.recordings_dir, filename)
+            try:
+                probed = probe_recording(video_path)
+            except OSError as error:
+                print(f"Skipping {filename}: {error}")
+                continue
+            self.add_recording(video_path, session_id=os.path.splitext(filename)[0],
+                               start_time=probed["start_time"], end_time=probed["end_time"],
+                               frame_count=probed["frame_count"], fps=probed["fps"], codec=probed["codec"])
+        return len(added), len(removed)
+
+
+def format_recording(recording):
+    """Render a catalog row as the one-line text shown on the recordings page."""
+    def when(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "Unknown"
+
+    details = [f"Start: {when(recording['start_time'])}", f"End: {when(recording['end_time'])}"]
+    if recording["username"]:
+        details.append(f"user: {recording['username']}")
+    if recording["duration"] is not None:
+        details.append(f"{recording['duration']:.0f}s")
+    if recording["size_bytes"] is not None:
+        details.append(f"{recording['size_bytes'] / 1e6:.1f} MB")
+    if recording["incident_count"]:
+        details.append(f"incidents: {recording['incident_count']}")
+    return f"{recording['filename']} ({', '.join(details)})"
+
+
+def day_range(date_text):
+    """(since, until) timestamps covering one YYYY-MM-DD day in local time."""
+    day = datetime.strptime(date_text, "%Y-%m-%d")
+    return day.timestamp(), (day + timedelta(days=1)).timestamp()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_recordings_catalog():
+    """Return the process-wide RecordingsCatalog, opening it on first use."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = RecordingsCatalog()
+        return _catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("reconcile", help="index new recordings and forget deleted ones")
+    list_parser = subparsers.add_parser("list", help="print catalogued recordings, newest first")
+    list_parser.add_argument("--user", default=None)
+    list_parser.add_argument("--date", default=None, help="YYYY-MM-DD")
+    list_parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    catalog = get_recordings_catalog()
+    if args.command == "reconcile":
+        started = time.perf_counter()
+        added, removed = catalog.reconcile()
+        print(f"Catalog reconciled in {time.perf_counter() - started:.1f}s: {added} added, {removed} removed, "
+              f"{catalog.count()} recordings")
+    else:
+        since, until = day_range(args.date) if args.date else (None, None)
+        for recording in catalog.query(args.user, since, until, limit=args.limit):
+            print(format_recording(recording))
+
+
+if __name__ == "__main__":
+    main()
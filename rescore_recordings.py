@@ -0,0 +1,220 @@
+"""Re-score archived recordings with the current model, without a display.
+
+    python rescore_recordings.py
+    python rescore_recordings.py --stride 5 --workers 8 recordings/proctoring_1700000000.avi
+
+Every recording goes through the same detect -> preprocess -> predict ->
+smooth -> incident steps as a live session in proctoring.py, with crops
+from consecutive sampled frames batched through the configured inference
+backend and one worker process per recording. Each "Possible Cheating"
+incident found is written to the alert store under the session id
+`<recording name>-rescore`.
+"""
+import argparse
+import functools
+import glob
+import multiprocessing
+import os
+import time
+from datetime import datetime
+
+import cv2
+
+from config import load_config
+from inference_engine import MAX_BATCH_SIZE
+from preprocessing import FramePreprocessor, pad_box
+from recorder import RECORDING_FPS, read_timestamp_sidecar
+from recordings_catalog import RECORDING_EXTENSIONS
+from session_scoring import SessionScorer
+
+
+RECORDINGS_GLOB = os.path.join("recordings", "*")
+FRAME_STRIDE = 5
+THREADS_PER_WORKER = 1
+RESCORE_SESSION_SUFFIX = "-rescore"
+RESCORE_USERNAME = "rescore"
+# Epoch values above this in a file name are milliseconds (1e11 seconds is thousands of years away).
+MILLISECOND_TIMESTAMP_MIN = 1e11
+
+_inference_engine = None
+_face_detector = None
+
+
+def _init_worker(config):
+    """Load the backend and face detector once per worker process."""
+    global _inference_engine, _face_detector
+    if config.get("backend", "keras") == "keras" and config.get("num_threads"):
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(config["num_threads"])
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    from backends import create_backend
+    from face_detector import FaceDetector
+    from inference_engine import InferenceEngine
+
+    _inference_engine = InferenceEngine(create_backend(config))
+    _face_detector = FaceDetector()
+    _face_detector.start()
+
+
+def recording_start_time(video_path):
+    """Best guess at when a recording without a timestamp sidecar started, from its file name."""
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    for part in reversed(stem.split("_")):
+        try:
+            value = float(part)
+        except ValueError:
+            continue
+        # Session ids carry milliseconds ("proctoring_<ms>[_<camera>]"); older recordings carry seconds.
+        return value / 1000 if value > MILLISECOND_TIMESTAMP_MIN else value
+    try:
+        return datetime.strptime(stem, "%Y-%m-%d_%H-%M-%S").timestamp()
+    except ValueError:
+        return os.path.getmtime(video_path)
+
+
+def rescore_recording(video_path, stride=FRAME_STRIDE, batch_size=MAX_BATCH_SIZE):
+    """Score every `stride`-th frame of one recording; returns a summary with the closed incidents."""
+    started = time.perf_counter()
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or RECORDING_FPS
+    sidecar = read_timestamp_sidecar(video_path)
+    frame_times = {index: (capture_time, duplicate) for index, _, capture_time, duplicate in sidecar or []}
+    start_time = recording_start_time(video_path)
+
+    incidents = []
+    scorer = SessionScorer(on_incident_end=incidents.append)
+    preprocessor = FramePreprocessor(batch_size=batch_size)
+    # (timestamp, padded face box or None) per sampled frame, in frame order; faces fill batch slots in turn.
+    pending = []
+    crops = 0
+    frames_read = frames_scored = faces = 0
+
+    def flush():
+        predictions = iter(_inference_engine.predict_batch(preprocessor.batch[:crops]) if crops else [])
+        for timestamp, face in pending:
+            if face is None:
+                scorer.no_face(timestamp)
+            else:
+                scorer.update(timestamp, face, *next(predictions))
+        pending.clear()
+
+    index = -1
+    try:
+        while cap.grab():
+            index += 1
+            frames_read += 1
+            if index % stride:
+                continue
+            timestamp, duplicate = frame_times.get(index, (start_time + index / fps, False))
+            if duplicate:
+                # The recorder repeated the previous frame to fill a capture gap; it carries no new information.
+                continue
+            ok, frame = cap.retrieve()
+            if not ok:
+                break
+            frames_scored += 1
+
+            rgb_frame = preprocessor.to_rgb(frame)
+            boxes = _face_detector.detect(rgb_frame)
+            if not boxes:
+                pending.append((timestamp, None))
+                continue
+            face = pad_box(boxes[0], rgb_frame.shape)
+            if preprocessor.crop(rgb_frame, face, slot=crops) is None:
+                pending.append((timestamp, None))
+                continue
+            pending.append((timestamp, face))
+            crops += 1
+            faces += 1
+            if crops == batch_size:
+                flush()
+                crops = 0
+        flush()
+        scorer.close()
+    finally:
+        cap.release()
+
+    return {
+        "path": video_path,
+        "session_id": os.path.splitext(os.path.basename(video_path))[0] + RESCORE_SESSION_SUFFIX,
+        "frames_read": frames_read,
+        "frames_scored": frames_scored,
+        "faces": faces,
+        "flagged": scorer.flagged,
+        "incidents": incidents,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _rescore_safely(video_path, **kwargs):
+    try:
+        return rescore_recording(video_path, **kwargs)
+    except Exception as error:
+        return {"path": video_path, "error": str(error)}
+
+
+def store_incidents(summary, username=RESCORE_USERNAME):
+    from alert_store import get_alert_store
+
+    store = get_alert_store()
+    for incident in summary["incidents"]:
+        timestamp = datetime.fromtimestamp(incident.start).strftime("%Y-%m-%d %H:%M:%S")
+        message = f"Re-scored: {incident.kind} detected at {timestamp}"
+        store.add_incident(summary["session_id"], username, incident, message=message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="*", help=f"recordings to re-score (default: {RECORDINGS_GLOB})")
+    parser.add_argument("--stride", type=int, default=FRAME_STRIDE, help="score every Nth frame")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE, help="face crops per inference call")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="recordings scored in parallel")
+    parser.add_argument("--threads", type=int, default=THREADS_PER_WORKER, help="inference threads per worker")
+    parser.add_argument("--username", default=RESCORE_USERNAME, help="user recorded against the new alerts")
+    parser.add_argument("--dry-run", action="store_true", help="print incidents without writing alerts")
+    args = parser.parse_args()
+
+    paths = args.recordings or sorted(
+        path for path in glob.glob(RECORDINGS_GLOB) if path.endswith(RECORDING_EXTENSIONS))
+    if not paths:
+        parser.error("no recordings to re-score")
+    config = load_config()
+    config["num_threads"] = args.threads
+    workers = max(1, min(args.workers, len(paths)))
+    score = functools.partial(_rescore_safely, stride=max(1, args.stride), batch_size=args.batch_size)
+
+    started = time.perf_counter()
+    frames_scored = incidents = failed = 0
+    # spawn, not fork: TensorFlow and MediaPipe do not survive being forked.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, initializer=_init_worker, initargs=(config,)) as pool:
+        for summary in pool.imap_unordered(score, paths):
+            if "error" in summary:
+                failed += 1
+                print(f"{summary['path']}: failed: {summary['error']}")
+                continue
+            frames_scored += summary["frames_scored"]
+            incidents += len(summary["incidents"])
+            print(f"{summary['path']}: {summary['frames_scored']}/{summary['frames_read']} frames, "
+                  f"{summary['faces']} faces, {len(summary['incidents'])} incidents, "
+                  f"{'Not Allowed' if summary['flagged'] else 'Allowed'} ({summary['seconds']:.1f}s)")
+            for incident in summary["incidents"]:
+                print(f"  {incident}")
+            if not args.dry_run:
+                store_incidents(summary, args.username)
+
+    if not args.dry_run and incidents:
+        from alert_store import get_alert_store
+
+        get_alert_store().flush()
+    elapsed = time.perf_counter() - started
+    print(f"Re-scored {len(paths) - failed}/{len(paths)} recordings, {frames_scored} frames, "
+          f"{incidents} incidents in {elapsed:.1f}s ({frames_scored / elapsed if elapsed else 0:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
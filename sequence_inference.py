@@ -0,0 +1,62 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from smoothing import probabilities_from_prediction
+
+
+WINDOW_SIZE = 16
+STRIDE = 4
+LATENCY_HISTORY = 200
+
+
+class SequenceInference:
+    """Windowed decisions from a rolling buffer of per-frame class probabilities.
+
+    Each crop is classified on its own through the shared InferenceEngine,
+    so it is batched with the other streams and runs on whichever backend
+    is configured. Every `stride` frames, once `window_size` predictions are
+    buffered, the window is decided as a whole by mean-pooling them; between
+    decisions the last window's probabilities are reported again. One
+    instance per stream, since the buffer is that stream's history.
+    """
+
+    def __init__(self, inference_engine, window_size=WINDOW_SIZE, stride=STRIDE, source=None):
+        self.inference_engine = inference_engine
+        self.window_size = window_size
+        self.stride = stride
+        self.source = source
+        self._probabilities = deque(maxlen=window_size)
+        self._frames_since_decision = 0
+        self.window_probabilities = None
+        self.window_latencies = deque(maxlen=LATENCY_HISTORY)
+
+    def reset(self):
+        self._probabilities.clear()
+        self._frames_since_decision = 0
+        self.window_probabilities = None
+
+    def predict(self, crop):
+        """Classify one crop; returns (label, confidence %, latest window probabilities or None)."""
+        label, confidence = self.inference_engine.predict(crop, self.source)
+        self._probabilities.append(probabilities_from_prediction(label, confidence))
+        self._frames_since_decision += 1
+
+        if len(self._probabilities) == self.window_size and self._frames_since_decision >= self.stride:
+            self._frames_since_decision = 0
+            started = time.perf_counter()
+            self.window_probabilities = np.mean(self._probabilities, axis=0)
+            self.window_latencies.append((time.perf_counter() - started) * 1000)
+        return label, confidence, self.window_probabilities
+
+    def latency_report(self):
+        """Summarise recent window decisions: count, mean and p95 latency in ms."""
+        if not self.window_latencies:
+            return {"windows": 0, "mean_ms": 0.0, "p95_ms": 0.0}
+        latencies = np.array(self.window_latencies)
+        return {
+            "windows": len(latencies),
+            "mean_ms": float(latencies.mean()),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        }
@@ -0,0 +1,68 @@
+import os
+import time
+from datetime import datetime
+
+import cv2
+
+from alert_store import get_alert_store
+from clip_buffer import CLIP_EXTENSION
+from preprocessing import pad_box
+
+
+def new_session_id(timestamp=None, camera=None):
+    """"proctoring_<ms>[_<camera>]"; milliseconds keep sessions started within the same second apart."""
+    session_id = f"proctoring_{int((timestamp or time.time()) * 1000)}"
+    return f"{session_id}_{camera}" if camera else session_id
+
+
+def find_face(rgb_frame, face_tracker, face_detector):
+    """Box of the tracked face if a tracker is running, else the detector's first face; None without a face."""
+    if face_tracker is not None:
+        return face_tracker.update(rgb_frame)
+    boxes = face_detector.detect(rgb_frame)
+    return boxes[0] if boxes else None
+
+
+def analyze_frame(rgb_frame, timestamp, preprocessor, face_tracker, face_detector, classify, scorer):
+    """Locate, classify and score the face in one RGB frame, drawing the decision onto the frame.
+
+    `classify(crop)` returns the (label, confidence %[, window probabilities])
+    that SessionScorer.update takes. Returns the padded face box with the
+    smoothed (label, confidence %), or (None, None, None) when there is no
+    face, which the scorer counts as an inactive frame.
+    """
+    box = find_face(rgb_frame, face_tracker, face_detector)
+    face = pad_box(box, rgb_frame.shape) if box is not None else None
+    crop = preprocessor.crop(rgb_frame, face) if face is not None else None
+    if crop is None:
+        scorer.no_face(timestamp)
+        return None, None, None
+
+    label, confidence = scorer.update(timestamp, face, *classify(crop[0]))
+
+    x_min, y_min, x_max, y_max = face
+    color = (0, 255, 0) if label == "Allowed" else (255, 0, 0)
+    cv2.rectangle(rgb_frame, (x_min, y_min), (x_max, y_max), color, 2)
+    cv2.putText(rgb_frame, f"{label} ({confidence:.2f}%)", (x_min, y_min - 10),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+    return face, label, confidence
+
+
+def start_incident_clip(session_id, clip_buffer, incident, alerts_dir, camera=None):
+    """Start the evidence clip of a just-confirmed incident and return its alert message."""
+    clip_filename = f"{session_id}_{int(incident.start * 1000)}{CLIP_EXTENSION}"
+    incident.evidence_path = clip_buffer.trigger(incident.start, os.path.join(alerts_dir, clip_filename))
+    return incident_message(incident, camera)
+
+
+def store_incident(session_id, username, incident, camera=None):
+    """Record one closed incident in the alert store; returns its alert message."""
+    message = incident_message(incident, camera)
+    get_alert_store().add_incident(session_id, username, incident, message=message)
+    return message
+
+
+def incident_message(incident, camera=None):
+    timestamp = datetime.fromtimestamp(incident.start).strftime("%Y-%m-%d %H:%M:%S")
+    message = f"Alert: {incident.kind} detected at {timestamp}"
+    return f"{message} on {camera}" if camera else message
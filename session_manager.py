@@ -0,0 +1,184 @@
+import os
+import time
+
+import cv2
+
+from clip_buffer import ClipBuffer
+from face_detector import FaceDetector
+from face_tracker import FaceTracker
+from fake_camera import open_capture
+from pipeline import CapturePipeline
+from preprocessing import FramePreprocessor
+from recorder import Recorder, recording_profile
+from recordings_catalog import get_recordings_catalog
+from session_analysis import analyze_frame, new_session_id, start_incident_clip, store_incident
+from session_scoring import SessionScorer
+from thumbnail_indexer import get_thumbnail_indexer
+
+
+RECORDINGS_DIR = "recordings"
+ALERTS_DIR = "alerts"
+THUMBNAIL_SIZE = (320, 240)
+REDETECT_INTERVAL = 10
+
+
+def parse_source(source):
+    """Camera indices may come from config or a text field as strings; stream URLs and file paths stay strings."""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source)
+    return source
+
+
+class CameraSession:
+    """One camera's capture pipeline, recording and incident state inside a SessionManager.
+
+    Frames are analysed on the pipeline's own worker thread, but every crop
+    goes through the shared InferenceEngine tagged with this camera's name,
+    so crops from all cameras are batched together and served round-robin.
+    `listener(session, event, incident)`, if given, is called with event
+    "start" when an incident is confirmed and "end" when it closes.
+    """
+
+    def __init__(self, name, source, inference_engine, username, duration=None, face_tracking=True,
+                 listener=None):
+        self.name = name
+        self.source = parse_source(source)
+        self.inference_engine = inference_engine
+        self.username = username
+        self.duration = duration
+        self.face_tracking = face_tracking
+        self.listener = listener
+        self.pipeline = None
+        self.face_detector = None
+        self.face_tracker = None
+        self.scorer = None
+        self.session_id = None
+        self.video_path = None
+        self.start_time = None
+        self.last_label = None
+
+    def start(self, timestamp=None):
+        self.session_id = new_session_id(timestamp, self.name)
+        profile = recording_profile()
+        self.video_path = os.path.join(RECORDINGS_DIR, f"{self.session_id}{profile['container']}")
+        os.makedirs(RECORDINGS_DIR, exist_ok=True)
+        os.makedirs(ALERTS_DIR, exist_ok=True)
+
+        self.clip_buffer = ClipBuffer(fps=profile["fps"])
+        recorder = Recorder.from_profile(self.video_path, profile, clip_buffer=self.clip_buffer)
+        self.preprocessor = FramePreprocessor()
+        self.scorer = SessionScorer(on_incident_start=self.start_incident, on_incident_end=self.store_incident)
+
+        # MediaPipe graphs keep per-stream state, so every camera gets its own detector.
+        self.face_detector = FaceDetector()
+        self.face_detector.warm_up()
+        if self.face_tracking:
+            self.face_tracker = FaceTracker(self.face_detector.detect, redetect_interval=REDETECT_INTERVAL,
+                                            color_order="rgb")
+        self.start_time = time.time()
+        self.pipeline = CapturePipeline(open_capture(self.source), self.analyze_frame,
+                                        recorder=recorder, duration=self.duration)
+        self.pipeline.start()
+
+    def stop(self):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+    def is_running(self):
+        return self.pipeline is not None and self.pipeline.is_running()
+
+    def analyze_frame(self, frame):
+        """Detect, classify and annotate one frame; returns the annotated RGB frame."""
+        rgb_frame = self.preprocessor.to_rgb(frame)
+        _, self.last_label, _ = analyze_frame(rgb_frame, time.time(), self.preprocessor, self.face_tracker,
+                                              self.face_detector, self.classify, self.scorer)
+        return rgb_frame
+
+    def classify(self, crop):
+        return self.inference_engine.predict(crop, source=self.name)
+
+    def latest_thumbnail(self, size=THUMBNAIL_SIZE):
+        """Newest analysed frame scaled down for the grid, or None if nothing new arrived."""
+        result = self.pipeline.latest_result() if self.pipeline is not None else None
+        if result is None:
+            return None
+        _, frame = result
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def analysis_fps(self):
+        elapsed = time.time() - self.start_time if self.start_time else 0.0
+        return self.pipeline.frames_analyzed / elapsed if elapsed > 0 else 0.0
+
+    def finish(self):
+        """Close incidents, release the detector and catalogue the recording once the pipeline has stopped."""
+        self.face_detector.stop()
+        self.scorer.close()
+        recorder = self.pipeline.recorder
+        get_recordings_catalog().add_recording(
+            self.video_path, session_id=self.session_id, username=self.username, start_time=self.start_time,
+            end_time=time.time(), frame_count=(self.pipeline.recording_stats or {}).get("frames_written"),
+            fps=recorder.fps, codec=recorder.fourcc, incident_count=self.scorer.cheating_incidents.incidents,
+        )
+        get_thumbnail_indexer().request(os.path.basename(self.video_path))
+        return {
+            "camera": self.name,
+            "source": self.source,
+            "video_path": self.video_path,
+            "frames_captured": self.pipeline.frames_captured,
+            "frames_analyzed": self.pipeline.frames_analyzed,
+            "analysis_fps": self.analysis_fps(),
+            "predictions": dict(self.scorer.prediction_counts),
+            "incidents": self.scorer.cheating_incidents.incidents,
+            "result": "Not Allowed" if self.scorer.flagged else "Allowed",
+            "recording": self.pipeline.recording_stats,
+        }
+
+    def start_incident(self, incident):
+        print(start_incident_clip(self.session_id, self.clip_buffer, incident, ALERTS_DIR, camera=self.name))
+        if self.listener is not None:
+            self.listener(self, "start", incident)
+
+    def store_incident(self, incident):
+        store_incident(self.session_id, self.username, incident, camera=self.name)
+        if self.listener is not None:
+            self.listener(self, "end", incident)
+
+
+class SessionManager:
+    """Runs one CameraSession per source, all sharing a single batched InferenceEngine."""
+
+    def __init__(self, sources, inference_engine, username, duration=None, face_tracking=True, listener=None):
+        self.inference_engine = inference_engine
+        self.sessions = [
+            CameraSession(f"cam{index}", source, inference_engine, username, duration, face_tracking, listener)
+            for index, source in enumerate(sources)
+        ]
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.time()
+        self.inference_engine.start()
+        for session in self.sessions:
+            session.start(self.start_time)
+
+    def stop(self):
+        for session in self.sessions:
+            session.stop()
+
+    def is_running(self):
+        return any(session.is_running() for session in self.sessions)
+
+    def throughput(self):
+        """Frames analysed per second across every camera."""
+        return sum(session.analysis_fps() for session in self.sessions)
+
+    def finish(self):
+        """Finish every camera and print per-camera and shared-engine stats; returns the summaries."""
+        summaries = [session.finish() for session in self.sessions]
+        for summary in summaries:
+            print(f"{summary['camera']} ({summary['source']}): {summary['result']}, "
+                  f"{summary['frames_analyzed']}/{summary['frames_captured']} frames analysed "
+                  f"({summary['analysis_fps']:.1f} fps), {summary['incidents']} incidents")
+        print(f"Total analysis throughput: {sum(s['analysis_fps'] for s in summaries):.1f} fps")
+        print("Inference latency:", self.inference_engine.latency_report())
+        return summaries
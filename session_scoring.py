@@ -0,0 +1,54 @@
+from incidents import IncidentEngine
+from smoothing import PredictionSmoother, probabilities_from_prediction
+
+
+CHEATING_INCIDENT = "Possible Cheating"
+CHEATING_ENTER_THRESHOLD = 60.0
+CHEATING_EXIT_THRESHOLD = 40.0
+CHEATING_MIN_DURATION = 1.0
+CHEATING_RELEASE_SECONDS = 2.0
+SMOOTHING_MODE = "ema"
+
+
+class SessionScorer:
+    """Per-session decision state shared by the live UI and headless re-scoring.
+
+    Takes one raw (label, confidence %) prediction per face frame, smooths
+    it, and feeds the smoothed "Not Allowed" probability to the
+    "Possible Cheating" incident engine. Frames without a face count as
+    inactive. `on_incident_start` / `on_incident_end` are passed through to
+    the IncidentEngine.
+    """
+
+    def __init__(self, on_incident_start=None, on_incident_end=None, smoothing_mode=SMOOTHING_MODE):
+        self.prediction_counts = {"Allowed": 0, "Not Allowed": 0}
+        self.smoother = PredictionSmoother(mode=smoothing_mode)
+        self.cheating_incidents = IncidentEngine(
+            CHEATING_INCIDENT,
+            on_start=on_incident_start,
+            on_end=on_incident_end,
+            enter_threshold=CHEATING_ENTER_THRESHOLD,
+            exit_threshold=CHEATING_EXIT_THRESHOLD,
+            min_duration=CHEATING_MIN_DURATION,
+            release_seconds=CHEATING_RELEASE_SECONDS,
+        )
+
+    @property
+    def flagged(self):
+        return self.smoother.flagged
+
+    def no_face(self, timestamp):
+        self.cheating_incidents.update(timestamp, 0.0)
+
+    def update(self, timestamp, face, raw_label, raw_confidence, window_probabilities=None):
+        """Score one face frame; returns the smoothed (label, confidence %)."""
+        self.prediction_counts[raw_label] += 1
+        if window_probabilities is None:
+            window_probabilities = probabilities_from_prediction(raw_label, raw_confidence)
+        label, confidence, smoothed = self.smoother.update(window_probabilities)
+        self.cheating_incidents.update(timestamp, float(smoothed[1]) * 100, face)
+        return label, confidence
+
+    def close(self):
+        """Close any open incident at the end of the session."""
+        return self.cheating_incidents.close()
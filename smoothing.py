@@ -0,0 +1,94 @@
+from collections import deque
+
+import numpy as np
+
+from inference_engine import CLASS_LABELS
+
+
+SMOOTHING_MODE = "ema"
+EMA_ALPHA = 0.3
+VOTE_WINDOW = 5
+VOTES_REQUIRED = 3
+DECISION_THRESHOLD = 0.5
+
+
+def probabilities_from_prediction(label, confidence, labels=CLASS_LABELS):
+    """Rebuild a two-class probability vector from a (label, confidence %) prediction."""
+    p = confidence / 100.0
+    return np.array([p, 1 - p] if label == labels[0] else [1 - p, p], dtype=np.float32)
+
+
+class PredictionSmoother:
+    """Streaming smoother over per-frame class probabilities.
+
+    mode="ema" keeps an exponential moving average (weight `alpha` on the
+    newest frame) and flags the positive class once its averaged
+    probability reaches `threshold`; the average starts from a prior that
+    puts no weight on the positive class, so the first frames have to agree
+    before it rises. mode="vote" flags it when at least `votes_required` of
+    the last `window` frames individually reached `threshold`, and reports
+    the share of the window that voted positive as the positive score.
+    Either way a single outlier frame cannot flip the label.
+    """
+
+    def __init__(self, mode=SMOOTHING_MODE, alpha=EMA_ALPHA, window=VOTE_WINDOW, votes_required=VOTES_REQUIRED,
+                 threshold=DECISION_THRESHOLD, labels=CLASS_LABELS, positive_index=1):
+        if mode not in ("ema", "vote"):
+            raise ValueError(f"Unknown smoothing mode: {mode}")
+        self.mode = mode
+        self.alpha = alpha
+        self.window = window
+        self.votes_required = votes_required
+        self.threshold = threshold
+        self.labels = labels
+        self.positive_index = positive_index
+        self.reset()
+
+    def reset(self):
+        self._ema = None
+        self._history = deque(maxlen=self.window)
+        self.decision_counts = {label: 0 for label in self.labels}
+
+    def update(self, probabilities):
+        """Add one frame's class probabilities; returns (label, confidence %, smoothed probabilities)."""
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        self._history.append(probabilities)
+
+        if self._ema is None:
+            self._ema = self._negative_prior(len(probabilities))
+        self._ema = self.alpha * probabilities + (1 - self.alpha) * self._ema
+
+        if self.mode == "ema":
+            smoothed = self._ema
+            positive = smoothed[self.positive_index] >= self.threshold
+        else:
+            votes = sum(1 for p in self._history if p[self.positive_index] >= self.threshold)
+            positive = votes >= self.votes_required
+            smoothed = self._vote_scores(votes)
+
+        if positive:
+            class_index = self.positive_index
+        else:
+            others = [i for i in range(len(smoothed)) if i != self.positive_index]
+            class_index = max(others, key=lambda i: smoothed[i])
+        label = self.labels[class_index]
+        self.decision_counts[label] += 1
+        return label, float(smoothed[class_index]) * 100, smoothed
+
+    def _negative_prior(self, size):
+        prior = np.full(size, 1.0 / (size - 1), dtype=np.float32)
+        prior[self.positive_index] = 0.0
+        return prior
+
+    def _vote_scores(self, votes):
+        """Positive score = share of the full window that voted positive; the rest split as the mean probabilities."""
+        positive_share = votes / self.window
+        mean = np.mean(self._history, axis=0)
+        others = np.delete(mean, self.positive_index)
+        others = others / others.sum() if others.sum() > 0 else np.full(len(others), 1.0 / len(others))
+        return np.insert(others * (1 - positive_share), self.positive_index, positive_share).astype(np.float32)
+
+    @property
+    def flagged(self):
+        """True once any frame of the stream has been smoothed to the positive label."""
+        return self.decision_counts[self.labels[self.positive_index]] > 0
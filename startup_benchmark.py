@@ -0,0 +1,92 @@
+"""Measure import-time cost of the login -> menu startup path.
+
+Runs each stage in a fresh interpreter with `python -X importtime`, sums the
+cumulative import time per stage and lists the slowest modules, e.g.
+
+    python startup_benchmark.py --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+STAGES = [
+    ("main.py", "import main"),
+    ("LoginSignupApp", "from login_signup import LoginSignupApp"),
+    ("MenuPage", "from menu import MenuPage"),
+]
+HEAVY_MODULES = ("tensorflow", "keras", "mediapipe")
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, cumulative_us)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        rows.append((fields[2].rstrip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def measure_stage(statement):
+    """Import a stage in a fresh interpreter and return its importtime rows."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def summarize(rows, top):
+    # Top-level imports are the rows with no leading indentation in the module column.
+    total_us = sum(cumulative for module, _, cumulative in rows if not module.startswith("  "))
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    heavy = sorted({module.strip().split(".")[0] for module, _, _ in rows} & set(HEAVY_MODULES))
+    return {
+        "total_ms": total_us / 1000,
+        "modules": len(rows),
+        "heavy_imports": heavy,
+        "slowest_self_ms": [(module.strip(), self_us / 1000) for module, self_us, _ in slowest],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list per stage")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if any stage exceeds this import time")
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = {}
+    for name, statement in STAGES:
+        report[name] = summarize(measure_stage(statement), args.top)
+
+    over_budget = False
+    for name, summary in report.items():
+        print(f"{name}: {summary['total_ms']:.1f} ms across {summary['modules']} modules")
+        if summary["heavy_imports"]:
+            print(f"  heavy imports: {', '.join(summary['heavy_imports'])}")
+        for module, self_ms in summary["slowest_self_ms"]:
+            print(f"  {self_ms:8.1f} ms  {module}")
+        if args.budget_ms is not None and summary["total_ms"] > args.budget_ms:
+            print(f"  over budget ({args.budget_ms:.0f} ms)")
+            over_budget = True
+
+    if args.json_path:
+        with open(args.json_path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
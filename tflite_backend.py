@@ -0,0 +1,95 @@
+import threading
+
+import numpy as np
+
+try:
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    Interpreter = None
+
+
+TFLITE_MODEL_PATH = "CNN_Model2.tflite"
+NUM_THREADS = 2
+
+
+def _create_interpreter(model_path, model_content, num_threads):
+    """Prefer the standalone tflite_runtime wheel; fall back to the interpreter bundled with TensorFlow."""
+    interpreter_class = Interpreter
+    if interpreter_class is None:
+        import tensorflow as tf
+
+        interpreter_class = tf.lite.Interpreter
+    if model_content is not None:
+        return interpreter_class(model_content=model_content, num_threads=num_threads)
+    return interpreter_class(model_path=model_path, num_threads=num_threads)
+
+
+class TFLiteClassifier:
+    """CNN_Model2 exported to TFLite (float16 or int8), run through the TFLite interpreter.
+
+    Accepts uint8 RGB crops shaped (N, 128, 128, 3) and returns float class
+    probabilities, quantizing inputs and dequantizing outputs when the
+    exported model uses integer I/O.
+
+    With `use_mmap=True` (the default) the interpreter is built from the
+    file path, which TFLite maps read-only, so several processes serving
+    the same model share its pages in the OS page cache. With `use_mmap=False`
+    the flatbuffer is read into this process's memory once instead.
+    One interpreter is kept per batch size so switching between batch
+    sizes never re-allocates tensors; `prepare` builds them ahead of time.
+    """
+
+    def __init__(self, model_path=TFLITE_MODEL_PATH, num_threads=NUM_THREADS, use_mmap=True):
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.use_mmap = use_mmap
+        self._model_content = None
+        if not use_mmap:
+            with open(model_path, "rb") as model_file:
+                self._model_content = model_file.read()
+
+        interpreter = _create_interpreter(model_path, self._model_content, num_threads)
+        interpreter.allocate_tensors()
+        self._input = interpreter.get_input_details()[0]
+        self._output = interpreter.get_output_details()[0]
+        self._interpreters = {int(self._input["shape"][0]): interpreter}
+        self._lock = threading.Lock()
+
+    def prepare(self, batch_sizes):
+        """Build and allocate the interpreters for these batch sizes before the first real call."""
+        with self._lock:
+            for batch_size in batch_sizes:
+                self._interpreter_for(batch_size)
+
+    def _interpreter_for(self, batch_size):
+        interpreter = self._interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = _create_interpreter(self.model_path, self._model_content, self.num_threads)
+            interpreter.resize_tensor_input(self._input["index"], [batch_size, *self._input["shape"][1:]])
+            interpreter.allocate_tensors()
+            self._interpreters[batch_size] = interpreter
+        return interpreter
+
+    def predict_probabilities(self, crops):
+        with self._lock:
+            return self._invoke(np.asarray(crops))
+
+    def _invoke(self, crops):
+        interpreter = self._interpreter_for(len(crops))
+
+        input_dtype = self._input["dtype"]
+        scale, zero_point = self._input["quantization"]
+        if input_dtype in (np.uint8, np.int8) and scale:
+            data = np.round(crops.astype(np.float32) / scale + zero_point)
+            data = np.clip(data, np.iinfo(input_dtype).min, np.iinfo(input_dtype).max).astype(input_dtype)
+        else:
+            data = crops.astype(input_dtype)
+
+        interpreter.set_tensor(self._input["index"], data)
+        interpreter.invoke()
+        output = interpreter.get_tensor(self._output["index"])
+
+        scale, zero_point = self._output["quantization"]
+        if self._output["dtype"] in (np.uint8, np.int8) and scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output.astype(np.float32)
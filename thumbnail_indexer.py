@@ -0,0 +1,263 @@
+"""Background indexer that extracts poster frames and incident keyframes from recordings.
+
+    python thumbnail_indexer.py           # index every catalogued recording not yet indexed
+
+Thumbnails are small JPEGs stored once per distinct image under
+thumbnail_cache/<sha1[:2]>/<sha1>.jpg, with an SQLite index mapping
+recordings to them. When the cache grows past CACHE_MAX_BYTES the least
+recently viewed images are evicted.
+"""
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import cv2
+
+from alert_store import connect_db, get_alert_store
+from recorder import frame_index_at, read_timestamp_sidecar
+from recordings_catalog import RECORDINGS_DIR, get_recordings_catalog
+
+
+THUMBNAIL_CACHE_DIR = "thumbnail_cache"
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+THUMBNAIL_SIZE = (160, 120)
+JPEG_QUALITY = 75
+POSTER_SECONDS = 1.0
+MAX_INCIDENT_KEYFRAMES = 6
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        sha1 TEXT PRIMARY KEY,
+        size_bytes INTEGER NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs (last_access);
+    CREATE TABLE IF NOT EXISTS thumbnails (
+        filename TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        timestamp REAL,
+        sha1 TEXT NOT NULL,
+        PRIMARY KEY (filename, kind, timestamp)
+    );
+    CREATE TABLE IF NOT EXISTS indexed (
+        filename TEXT PRIMARY KEY,
+        mtime REAL NOT NULL,
+        indexed_at REAL NOT NULL
+    );
+"""
+
+
+class ThumbnailCache:
+    """Content-addressed JPEG store with least-recently-used eviction by total size."""
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = connect_db(os.path.join(cache_dir, "index.db"))
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def blob_path(self, sha1):
+        return os.path.join(self.cache_dir, sha1[:2], f"{sha1}.jpg")
+
+    def put(self, jpeg_bytes):
+        """Store one JPEG (deduplicated by content) and return its sha1."""
+        sha1 = hashlib.sha1(jpeg_bytes).hexdigest()
+        path = self.blob_path(sha1)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "wb") as blob_file:
+                blob_file.write(jpeg_bytes)
+            os.replace(temporary_path, path)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO blobs (sha1, size_bytes, last_access) VALUES (?, ?, ?)",
+                               (sha1, len(jpeg_bytes), time.time()))
+        return sha1
+
+    def record(self, filename, kind, timestamp, sha1):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO thumbnails (filename, kind, timestamp, sha1) VALUES (?, ?, ?, ?)",
+                               (filename, kind, timestamp, sha1))
+
+    def mark_indexed(self, filename, mtime):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO indexed (filename, mtime, indexed_at) VALUES (?, ?, ?)",
+                               (filename, mtime, time.time()))
+
+    def is_indexed(self, filename, mtime):
+        with self._lock:
+            row = self._conn.execute("SELECT mtime FROM indexed WHERE filename = ?", (filename,)).fetchone()
+        return row is not None and row[0] == mtime
+
+    def thumbnails(self, filename):
+        """[(kind, timestamp, jpeg path)] for a recording, poster first, marking each image as recently used."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT kind, timestamp, sha1 FROM thumbnails WHERE filename = ? "
+                "ORDER BY kind = 'poster' DESC, timestamp", (filename,)).fetchall()
+            self._conn.executemany("UPDATE blobs SET last_access = ? WHERE sha1 = ?",
+                                   [(time.time(), sha1) for _, _, sha1 in rows])
+        return [(kind, timestamp, self.blob_path(sha1)) for kind, timestamp, sha1 in rows
+                if os.path.exists(self.blob_path(sha1))]
+
+    def forget(self, filename):
+        """Drop a recording's thumbnails from the index; the images go once they are evicted."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM thumbnails WHERE filename = ?", (filename,))
+            self._conn.execute("DELETE FROM indexed WHERE filename = ?", (filename,))
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM blobs").fetchone()[0]
+
+    def evict(self):
+        """Delete least recently used images until the cache fits in max_bytes; returns bytes freed."""
+        excess = self.total_bytes() - self.max_bytes
+        freed = 0
+        if excess <= 0:
+            return 0
+        with self._lock:
+            candidates = self._conn.execute("SELECT sha1, size_bytes FROM blobs ORDER BY last_access").fetchall()
+        evicted = []
+        for sha1, size_bytes in candidates:
+            if freed >= excess:
+                break
+            try:
+                os.remove(self.blob_path(sha1))
+            except FileNotFoundError:
+                pass
+            evicted.append(sha1)
+            freed += size_bytes
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM blobs WHERE sha1 = ?", [(sha1,) for sha1 in evicted])
+            self._conn.executemany("DELETE FROM thumbnails WHERE sha1 = ?", [(sha1,) for sha1 in evicted])
+        return freed
+
+
+class ThumbnailIndexer:
+    """Extracts a poster frame and incident keyframes per recording on a background thread.
+
+    `start` queues every catalogued recording; those whose file has not
+    changed since they were last indexed are skipped, so each pass only
+    decodes new recordings. `request` puts one recording at the front, e.g.
+    when it is selected on the recordings page or a session has just ended.
+    """
+
+    def __init__(self, cache=None, recordings_dir=RECORDINGS_DIR):
+        self.cache = cache or ThumbnailCache()
+        self.recordings_dir = recordings_dir
+        self._queue = queue.PriorityQueue()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.recordings_indexed = 0
+
+    def start(self):
+        """Queue recordings that are new or changed since the last pass and make sure the worker runs."""
+        # None asks the worker to list the catalog itself, keeping the query off the caller's (UI) thread.
+        self._enqueue(None, priority=1)
+
+    def request(self, filename):
+        """Index one recording ahead of the backlog, re-extracting thumbnails that were evicted."""
+        self._enqueue(filename, priority=0, force=True)
+
+    def _enqueue(self, filename, priority, force=False):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._index_loop, name="thumbnail-indexer", daemon=True)
+                self._thread.start()
+            self._sequence += 1
+            self._queue.put((priority, self._sequence, filename, force))
+
+    def _index_loop(self):
+        while True:
+            _, _, filename, force = self._queue.get()
+            if filename is None:
+                for recording in get_recordings_catalog().query():
+                    self._enqueue(recording["filename"], priority=2)
+                continue
+            try:
+                self.index_recording(filename, force)
+            except (OSError, cv2.error, sqlite3.Error) as error:
+                print(f"Thumbnail indexing failed for {filename}: {error}")
+
+    def index_recording(self, filename, force=False):
+        """Extract and cache thumbnails for one recording unless it is already indexed."""
+        video_path = os.path.join(self.recordings_dir, filename)
+        if not os.path.exists(video_path):
+            return False
+        mtime = os.path.getmtime(video_path)
+        if not force and self.cache.is_indexed(filename, mtime):
+            return False
+
+        recording = get_recordings_catalog().get(filename) or {}
+        sidecar = read_timestamp_sidecar(video_path)
+        capture_times = [capture_time for _, _, capture_time, _ in sidecar] if sidecar else []
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or recording.get("fps") or 10.0
+            start_time = capture_times[0] if capture_times else recording.get("start_time") or mtime
+            targets = [("poster", start_time + POSTER_SECONDS)]
+            session_id = recording.get("session_id") or os.path.splitext(filename)[0]
+            alert_store = get_alert_store()
+            alert_store.flush()
+            for alert in alert_store.query(session_id=session_id, newest_first=False, limit=MAX_INCIDENT_KEYFRAMES):
+                end = alert["end_timestamp"] if alert["end_timestamp"] is not None else alert["timestamp"]
+                targets.append(("incident", (alert["timestamp"] + end) / 2))
+
+            self.cache.forget(filename)
+            for kind, timestamp in targets:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index_at(timestamp, capture_times, start_time, fps))
+                ret, frame = cap.read()
+                if not ret and kind == "poster":
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ret, frame = cap.read()
+                if not ret:
+                    continue
+                thumbnail = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+                ok, encoded = cv2.imencode(".jpg", thumbnail, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+                if ok:
+                    self.cache.record(filename, kind, timestamp, self.cache.put(encoded.tobytes()))
+        finally:
+            cap.release()
+
+        self.cache.mark_indexed(filename, mtime)
+        self.cache.evict()
+        self.recordings_indexed += 1
+        return True
+
+    def thumbnails(self, filename):
+        return self.cache.thumbnails(filename)
+
+
+_indexer = None
+_indexer_lock = threading.Lock()
+
+
+def get_thumbnail_indexer():
+    """Return the process-wide ThumbnailIndexer, creating it on first use."""
+    global _indexer
+    with _indexer_lock:
+        if _indexer is None:
+            _indexer = ThumbnailIndexer()
+        return _indexer
+
+
+def main():
+    get_recordings_catalog().reconcile()
+    indexer = ThumbnailIndexer()
+    started = time.perf_counter()
+    for recording in get_recordings_catalog().query():
+        indexer.index_recording(recording["filename"])
+    print(f"Indexed {indexer.recordings_indexed} recordings in {time.perf_counter() - started:.1f}s; "
+          f"cache holds {indexer.cache.total_bytes() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
+from tkinter import Entry, Frame, Label, Listbox, Scrollbar
+
+
+PAGE_SIZE = 100
+CACHED_PAGES = 8
+SEARCH_DELAY_MS = 250
+WHEEL_ROWS = 3
+
+
+class VirtualList(Frame):
+    """Scrollable list that only ever holds the rows on screen.
+
+    The backing store is reached through two callbacks: `count(search)`
+    returns how many rows match and `fetch(offset, limit, search)` returns
+    that slice of rows, e.g. a LIMIT/OFFSET query. Rows are fetched a page
+    (`page_size` rows) at a time and the last few pages are cached, so
+    scrolling through months of history only touches the pages in view.
+    Typing in the search box re-queries after a short pause.
+    """
+
+    def __init__(self, parent, count, fetch, format_row=str, on_select=None, empty_text="Nothing to show.",
+                 page_size=PAGE_SIZE, bg="#2E2F5B", fg="#FFFFFF", **listbox_options):
+        super().__init__(parent, bg=bg)
+        self.count_fn = count
+        self.fetch_fn = fetch
+        self.format_row = format_row
+        self.on_select = on_select
+        self.empty_text = empty_text
+        self.page_size = page_size
+
+        self.total = 0
+        self.offset = 0
+        self.visible_rows = int(listbox_options.get("height", 15))
+        self.selected_index = None
+        self._pages = OrderedDict()
+        self._search_job = None
+
+        search_frame = Frame(self, bg=bg)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        Label(search_frame, text="Search", bg=bg, fg=fg).pack(side="left", padx=5)
+        self.search_var = tk.StringVar()
+        Entry(search_frame, textvariable=self.search_var).pack(side="left", fill="x", expand=True)
+        self.status_label = Label(search_frame, text="", bg=bg, fg=fg)
+        self.status_label.pack(side="left", padx=5)
+        self.search_var.trace_add("write", self._on_search_changed)
+
+        self.listbox = Listbox(self, exportselection=False, **listbox_options)
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._row_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<MouseWheel>", lambda event: self.scroll(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS))
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-WHEEL_ROWS))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(WHEEL_ROWS))
+        self.listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda event: self._move_selection(-self.visible_rows))
+        self.listbox.bind("<Next>", lambda event: self._move_selection(self.visible_rows))
+
+    @property
+    def search(self):
+        return self.search_var.get().strip() or None
+
+    def refresh(self, keep_position=True):
+        """Re-count and re-fetch from the store, e.g. after rows were added, deleted or filters changed."""
+        self._pages.clear()
+        self.total = self.count_fn(self.search)
+        if not keep_position:
+            self.offset = 0
+            self.selected_index = None
+        if self.selected_index is not None and self.selected_index >= self.total:
+            self.selected_index = None
+        self._scroll_to(self.offset)
+
+    def selected_row(self):
+        """The backing-store row behind the current selection, or None."""
+        if self.selected_index is None:
+            return None
+        return self._row(self.selected_index)
+
+    def scroll(self, rows):
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def _row(self, index):
+        page_index, position = divmod(index, self.page_size)
+        page = self._pages.get(page_index)
+        if page is None:
+            page = self.fetch_fn(page_index * self.page_size, self.page_size, self.search)
+            self._pages[page_index] = page
+            if len(self._pages) > CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_index)
+        return page[position] if position < len(page) else None
+
+    def _scroll_to(self, offset):
+        self.offset = max(0, min(offset, self.total - self.visible_rows))
+        self._render()
+
+    def _render(self):
+        self.listbox.delete(0, tk.END)
+        if not self.total:
+            self.listbox.insert(tk.END, self.empty_text)
+        else:
+            for index in range(self.offset, min(self.offset + self.visible_rows, self.total)):
+                row = self._row(index)
+                if row is None:
+                    break
+                self.listbox.insert(tk.END, self.format_row(row))
+            if self.selected_index is not None and 0 <= self.selected_index - self.offset < self.visible_rows:
+                self.listbox.selection_set(self.selected_index - self.offset)
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.visible_rows) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        shown_to = min(self.offset + self.visible_rows, self.total)
+        self.status_label.config(text=f"{self.offset + 1 if self.total else 0}-{shown_to} of {self.total}")
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self._row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._scroll_to(self.offset)
+
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection or not self.total:
+            return
+        self.selected_index = self.offset + selection[0]
+        if self.on_select is not None:
+            self.on_select(self.selected_row())
+
+    def _move_selection(self, step):
+        if not self.total:
+            return "break"
+        current = self.selected_index if self.selected_index is not None else self.offset - 1
+        self.selected_index = max(0, min(self.total - 1, current + step))
+        if self.selected_index < self.offset:
+            self._scroll_to(self.selected_index)
+        elif self.selected_index >= self.offset + self.visible_rows:
+            self._scroll_to(self.selected_index - self.visible_rows + 1)
+        else:
+            self._render()
+        if self.on_select is not None:
+            self.on_select(self.selected_row())
+        return "break"
+
+    def _on_search_changed(self, *args):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.refresh(keep_position=False)
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import cv2
+import numpy as np
+
+
+REQUEST_TIMEOUT = 2.0
+POLL_INTERVAL = 0.1
+
+
+class WorkerClient:
+    """Small JSON client for the HTTP API served by proctoring_worker.py."""
+
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None, timeout=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = Request(f"{self.base_url}{path}", data=data, method=method,
+                          headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urlopen(request, timeout=timeout or self.timeout) as response:
+                return response.status, response.headers.get("Content-Type", ""), response.read()
+        except HTTPError as error:
+            message = json.loads(error.read() or b"{}").get("error", error.reason)
+            raise RuntimeError(f"Worker returned {error.code}: {message}")
+
+    def _json(self, method, path, payload=None, timeout=None):
+        _, _, body = self._request(method, path, payload, timeout)
+        return json.loads(body)
+
+    def status(self):
+        return self._json("GET", "/status")
+
+    def metrics(self):
+        return self._json("GET", "/metrics")
+
+    def start_session(self, sources, username, duration=None):
+        return self._json("POST", "/sessions", {"sources": sources, "username": username, "duration": duration})
+
+    def stop_session(self, session_id):
+        return self._json("POST", f"/sessions/{session_id}/stop", {})
+
+    def session_status(self, session_id):
+        return self._json("GET", f"/sessions/{session_id}")
+
+    def incidents(self, after=0, timeout=0.0):
+        return self._json("GET", f"/incidents?after={after}&timeout={timeout}", timeout=self.timeout + timeout)
+
+    def thumbnail(self, session_id, camera):
+        """Newest annotated thumbnail as an RGB array, or None if the camera has not produced one yet."""
+        status, _, body = self._request("GET", f"/sessions/{session_id}/cameras/{camera}/frame.jpg")
+        if status == 204 or not body:
+            return None
+        frame = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if frame is not None else None
+
+
+class RemoteCameraSession:
+    """Client-side view of one camera in a worker session, mirroring session_manager.CameraSession."""
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.last_label = None
+        self.fps = 0.0
+        self._thumbnail = None
+        self._lock = threading.Lock()
+
+    def set_thumbnail(self, thumbnail):
+        with self._lock:
+            self._thumbnail = thumbnail
+
+    def latest_thumbnail(self):
+        with self._lock:
+            thumbnail, self._thumbnail = self._thumbnail, None
+        return thumbnail
+
+    def analysis_fps(self):
+        return self.fps
+
+
+class RemoteSessionManager:
+    """Drives a session on a proctoring worker with the same interface as session_manager.SessionManager.
+
+    Status and thumbnails are fetched on a background thread, so a slow
+    worker or network never blocks the Tk event loop that reads them.
+    """
+
+    def __init__(self, client, sources, username, duration=None):
+        self.client = client
+        self.sources = sources
+        self.username = username
+        self.duration = duration
+        self.session_id = None
+        self.sessions = [RemoteCameraSession(f"cam{index}", source) for index, source in enumerate(sources)]
+        self._throughput = 0.0
+        self._summaries = None
+        self._running = False
+        self._poller = None
+        self._stop_requested = False
+
+    def start(self):
+        response = self.client.start_session(self.sources, self.username, self.duration)
+        self.session_id = response["session_id"]
+        self._running = True
+        self._poller = threading.Thread(target=self._poll_loop, name="worker-poller", daemon=True)
+        self._poller.start()
+
+    def stop(self):
+        """Ask the worker to stop the session, once, without blocking the caller."""
+        if self.session_id is None or self._stop_requested:
+            return
+        self._stop_requested = True
+        threading.Thread(target=self._send_stop, name="worker-stop", daemon=True).start()
+
+    def _send_stop(self):
+        try:
+            self.client.stop_session(self.session_id)
+        except (OSError, RuntimeError) as error:
+            print(f"Could not stop worker session {self.session_id}: {error}")
+            self._stop_requested = False
+
+    def is_running(self):
+        return self._running
+
+    def throughput(self):
+        return self._throughput
+
+    def finish(self):
+        return self._summaries or []
+
+    def _poll_loop(self):
+        while self._running:
+            try:
+                status = self.client.session_status(self.session_id)
+                for session, camera in zip(self.sessions, status["cameras"]):
+                    session.last_label = camera["label"]
+                    session.fps = camera["fps"]
+                    thumbnail = self.client.thumbnail(self.session_id, session.name)
+                    if thumbnail is not None:
+                        session.set_thumbnail(thumbnail)
+                self._throughput = status["throughput"]
+                if not status["running"]:
+                    if status.get("error"):
+                        print(f"Worker session {self.session_id} failed to finish: {status['error']}")
+                    self._summaries = status["summaries"]
+                    self._running = False
+            except (OSError, RuntimeError) as error:
+                print(f"Proctoring worker unreachable: {error}")
+            time.sleep(POLL_INTERVAL)